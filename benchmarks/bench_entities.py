@@ -0,0 +1,84 @@
+"""Benchmark multi-entity project generation at increasing entity counts.
+
+For 10, 100 and 500 entities (by default), measures rendering the whole
+project, the peak memory of rendering it into a dict versus streaming it,
+and streaming it to disk through ``writer.write_project``. Per-entity figures
+should stay flat as the count grows.
+
+Usage:
+    python benchmarks/bench_entities.py [--counts 10 100 500] [--repeat 5]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fastapi_boilerplate_agent.tools import iter_fastapi_boilerplate
+from fastapi_boilerplate_agent.writer import write_project
+
+
+def make_config(count: int) -> dict:
+    return {
+        "project_name": "Monolith",
+        "db": "postgres",
+        "docker": True,
+        "entities": [f"Resource{index}" for index in range(count)],
+    }
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def drain(iterator) -> None:
+    for _ in iterator:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best kept)")
+    args = parser.parse_args()
+
+    print(
+        f"{'entities':>8}{'files':>8}{'render ms':>12}{'us/entity':>12}"
+        f"{'dict peak MB':>15}{'stream peak MB':>16}{'write ms':>11}"
+    )
+    for count in args.counts:
+        config = make_config(count)
+        files = dict(iter_fastapi_boilerplate(config))
+        render_s = best_of(args.repeat, lambda: dict(iter_fastapi_boilerplate(config)))
+        dict_peak = peak_memory(lambda: dict(iter_fastapi_boilerplate(config)))
+        stream_peak = peak_memory(lambda: drain(iter_fastapi_boilerplate(config)))
+        with tempfile.TemporaryDirectory() as tmp:
+            # A fresh directory per run, so that no file is skipped as unchanged
+            run_dirs = iter(Path(tmp) / str(run) for run in range(args.repeat))
+            write_s = best_of(
+                args.repeat,
+                lambda: write_project(iter_fastapi_boilerplate(config), next(run_dirs)),
+            )
+        print(
+            f"{count:>8}{len(files):>8}{render_s * 1e3:>12.2f}{render_s / count * 1e6:>12.1f}"
+            f"{dict_peak / 2**20:>15.2f}{stream_peak / 2**20:>16.2f}{write_s * 1e3:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
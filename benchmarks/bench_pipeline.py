@@ -0,0 +1,194 @@
+"""Benchmark suite for the generator pipeline.
+
+Measures the name helpers, ``generate_fastapi_boilerplate_func`` across the
+full db x docker x ci matrix (full renders) and from its memo, and
+end-to-end ``build_app().invoke`` runs. The LLM is replaced by a
+deterministic offline chat model, so the suite needs no API key and
+measures only this package (and LangChain/LangGraph overhead).
+
+Usage:
+    python benchmarks/bench_pipeline.py [--min-time 0.5] [--output results.json]
+    python benchmarks/bench_pipeline.py --compare baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Callable, Dict, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from fastapi_boilerplate_agent import graph
+from fastapi_boilerplate_agent.tools import (
+    clear_render_cache,
+    generate_fastapi_boilerplate_func,
+    to_class_name,
+    to_snake_case,
+)
+
+PROJECT_NAMES = ["BrainROI", "my_fastapi_app", "Invest With Me", "ticket-system"]
+DBS = ["postgres", "sqlite"]
+DOCKER = [True, False]
+CIS = ["github", "gitlab", "none"]
+
+# Phrased so that the rule-based fast path cannot handle it and the LLM node runs
+FREE_FORM_REQUEST = "I need an API for my bakery, call it 'BreadBoard', something light"
+STRUCTURED_REQUEST = (
+    "Generate a FastAPI backend called 'BreadBoard' with PostgreSQL, Docker and GitHub Actions."
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic offline stand-in for ``ChatOpenAI``.
+
+    Answers with a ``ProjectConfig`` JSON derived from the quoted project name
+    in the request, the way the real model would be prompted to.
+    """
+
+    def _reply(self, messages) -> ChatResult:
+        text = messages[-1].content
+        match = re.search(r"'([^']+)'", text)
+        config = {
+            "project_name": match.group(1) if match else "fastapi_app",
+            "db": "sqlite" if "sqlite" in text.lower() else "postgres",
+            "auth_enabled": True,
+            "docker": True,
+            "ci": "github",
+        }
+        message = AIMessage(content=json.dumps(config))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._reply(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._reply(messages)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+
+def measure(func: Callable[[], object], min_time: float, min_runs: int = 20) -> Dict[str, float]:
+    """Call ``func`` repeatedly for at least ``min_time`` seconds and summarize latencies."""
+    for _ in range(3):  # warm up caches and lazy imports
+        func()
+    samples: List[int] = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_runs or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        func()
+        samples.append(time.perf_counter_ns() - start)
+
+    samples.sort()
+    total_s = sum(samples) / 1e9
+
+    def percentile(p: float) -> float:
+        return samples[min(len(samples) - 1, int(p * len(samples)))] / 1e3
+
+    return {
+        "runs": len(samples),
+        "ops_per_sec": len(samples) / total_s,
+        "mean_us": total_s / len(samples) * 1e6,
+        "p50_us": percentile(0.50),
+        "p99_us": percentile(0.99),
+    }
+
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    cases: Dict[str, Callable[[], object]] = {
+        "to_snake_case": lambda: [to_snake_case(name) for name in PROJECT_NAMES],
+        "to_class_name": lambda: [to_class_name(name) for name in PROJECT_NAMES],
+    }
+
+    # generate_fastapi_boilerplate_func is memoized: the matrix clears the
+    # memo on every call so that it measures full renders
+    def generate_uncached(config):
+        clear_render_cache()
+        return generate_fastapi_boilerplate_func(config)
+
+    for db, docker, ci in itertools.product(DBS, DOCKER, CIS):
+        config = {"project_name": "BrainROI", "db": db, "docker": docker, "ci": ci}
+        label = f"generate[{db}-{'docker' if docker else 'nodocker'}-{ci}]"
+        cases[label] = lambda config=config: generate_uncached(config)
+
+    config = {"project_name": "BrainROI"}
+    cases["generate_cached"] = lambda: generate_fastapi_boilerplate_func(config)
+
+    graph.llm = FakeChatModel()
+    app = graph.build_app()
+    for label, request in (("fast_path", STRUCTURED_REQUEST), ("llm_path", FREE_FORM_REQUEST)):
+        state = {"user_request": request, "config": None, "files": None}
+        cases[f"invoke[{label}]"] = lambda state=state: app.invoke(state)
+    return cases
+
+
+def run_suite(min_time: float, pattern: str = "") -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, func in build_cases().items():
+        if pattern and not re.search(pattern, name):
+            continue
+        results[name] = measure(func, min_time)
+        stats = results[name]
+        print(
+            f"{name:<38}{stats['ops_per_sec']:>14,.0f} ops/s"
+            f"{stats['p50_us']:>12.1f} us p50{stats['p99_us']:>12.1f} us p99"
+        )
+    return results
+
+
+def metadata_block() -> Dict[str, str]:
+    try:
+        version = metadata.version("fastapi-boilerplate-generator")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "package_version": version,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str) -> None:
+    """Print the p50 latency of each benchmark relative to a saved run."""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('package_version')}):")
+    for name, stats in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:<38}{'new':>14}")
+            continue
+        before, after = previous["p50_us"], stats["p50_us"]
+        print(f"{name:<38}{after / before:>13.2f}x p50 ({before:.1f} -> {after:.1f} us)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per benchmark")
+    parser.add_argument("--filter", default="", help="Only run benchmarks matching this regex")
+    parser.add_argument("--output", help="Save results as JSON to this path")
+    parser.add_argument("--compare", metavar="JSON", help="Compare with a saved results file")
+    args = parser.parse_args()
+
+    results = run_suite(args.min_time, args.filter)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"meta": metadata_block(), "results": results}, handle, indent=2)
+        print(f"\nSaved results to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Persistent on-disk cache for LLM config extraction.
+
+Entries are content-addressed: the key is a hash of the normalized request,
+the model name and the prompt version, so changing the prompt or the model
+naturally invalidates old entries. Each entry is a small JSON file holding
+the parsed ``ProjectConfig``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .config import ProjectConfig
+
+# Defaults: keep entries for a week, and at most ~5 MB of them
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache directory (honours ``XDG_CACHE_HOME``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "fastapi-boilerplate"
+
+
+def normalize_request(user_request: str) -> str:
+    """Normalize a request so that whitespace-only differences share an entry."""
+    return " ".join(user_request.split())
+
+
+class ConfigCache:
+    """Content-addressed cache of ``ProjectConfig`` results with size and age eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(user_request: str, model_name: str, prompt_version: str) -> str:
+        """Build the cache key for a request."""
+        payload = json.dumps([prompt_version, model_name, normalize_request(user_request)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional["ProjectConfig"]:
+        """Return the cached config for ``key``, or ``None`` on a miss.
+
+        Expired or unreadable entries are removed and count as a miss.
+        """
+        # Imported here so that the CLI can create a cache without loading pydantic
+        from .config import ProjectConfig
+
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return ProjectConfig(**json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError):  # pydantic's ValidationError is a ValueError
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, config: "ProjectConfig") -> None:
+        """Store ``config`` under ``key`` and evict entries over the limits.
+
+        The entry is written to a temporary file and renamed into place, so
+        concurrent readers (e.g. batch workers) never see a partial file.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(config.model_dump(), handle)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the oldest ones until under ``max_bytes``."""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            path.unlink(missing_ok=True)
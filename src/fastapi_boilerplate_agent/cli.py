@@ -1,6 +1,23 @@
+import argparse
+import asyncio
+import json
 import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from .graph import build_app
+from typing import Dict, List, Mapping, Optional
+
+from .cache import ConfigCache
+from .tracing import Tracer, span, tracing
+from .writer import Files, WriteReport, write_project
+
+# The LangChain/LangGraph stack (graph.py) is imported lazily, only by the
+# code paths that run the pipeline, so that the CLI starts instantly and
+# --config never loads it at all.
+
+# Compiled graph of a batch worker process (see _init_batch_worker)
+_worker_app = None
 
 
 def to_snake_case(name: str) -> str:
@@ -29,7 +46,627 @@ def get_yes_no(prompt: str, default: bool = True) -> bool:
     return response in ['y', 'yes']
 
 
-def main():
+def read_batch(batch_path: Path) -> List[str]:
+    """Read generation requests from a JSON Lines file.
+
+    Each non-empty line is either a JSON string or an object with a
+    ``user_request`` key, e.g. ``{"user_request": "Generate a FastAPI backend ..."}``.
+
+    Raises:
+        ValueError: If a line is not valid JSON or has no request text
+    """
+    requests = []
+    with batch_path.open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{batch_path}:{line_number}: invalid JSON ({e})") from e
+            request = entry.get("user_request") if isinstance(entry, dict) else entry
+            if not isinstance(request, str) or not request.strip():
+                raise ValueError(f"{batch_path}:{line_number}: missing 'user_request'")
+            requests.append(request)
+    return requests
+
+
+def write_generated_project(
+    files: Mapping[str, str],
+    out_dir: Path,
+    prune: bool = False,
+    check: bool = True,
+    precompile: bool = False,
+    check_workers: Optional[int] = None,
+) -> WriteReport:
+    """Check that the generated modules compile, then write the project.
+
+    Args:
+        files: Mapping of file path -> content
+        out_dir: Project directory
+        prune: Delete files that earlier runs generated but this one does not
+        check: Compile every ``.py`` file first, so nothing is written on a syntax error
+        precompile: Also write ``__pycache__`` bytecode (implies the compile check)
+        check_workers: Processes for the compile check of large projects
+
+    Raises:
+        SyntaxError: If a generated module does not compile
+    """
+    bytecode = {}
+    if check or precompile:
+        from .bytecode import check_project
+
+        with span("compile_check"):
+            bytecode = check_project(files, workers=check_workers, bytecode=precompile)
+    with span("write", files=len(files)):
+        report = write_project(files, out_dir, prune=prune)
+    if precompile:
+        from .bytecode import write_bytecode
+
+        with span("precompile"):
+            write_bytecode(out_dir, bytecode)
+    return report
+
+
+def _init_batch_worker(
+    cache: Optional[ConfigCache], structured_output: bool = False, template_packs=()
+) -> None:
+    """Compile the graph once per worker process, with the parent's template packs."""
+    from .graph import build_app
+    from .tools import templates
+
+    global _worker_app
+    templates.set_packs(template_packs)
+    _worker_app = build_app(cache=cache, structured_output=structured_output)
+
+
+def _batch_item_summary(
+    index: int,
+    project_name: str,
+    files: Mapping[str, str],
+    out_dir: Path,
+    generate_s: float,
+    prune: bool = False,
+    check: bool = True,
+    precompile: bool = False,
+) -> dict:
+    """Write one generated project to disk and describe how it went."""
+    started = time.perf_counter()
+    # Projects are already spread over workers: compile each one in-process
+    report = write_generated_project(
+        files, out_dir, prune=prune, check=check, precompile=precompile, check_workers=1
+    )
+    write_s = time.perf_counter() - started
+    return {
+        "index": index,
+        "ok": True,
+        "project_name": project_name,
+        "out_dir": str(out_dir),
+        "files": len(files),
+        "changes": report.summary(),
+        "generate_s": generate_s,
+        "write_s": write_s,
+        "total_s": generate_s + write_s,
+    }
+
+
+def _batch_item_failure(index: int, error: Exception, total_s: float) -> dict:
+    return {
+        "index": index,
+        "ok": False,
+        "error": f"{type(error).__name__}: {error}",
+        "total_s": total_s,
+    }
+
+
+def _batch_item_generated(index: int, result: dict, generate_s: float) -> dict:
+    config = result.get("config") or {}
+    return {
+        "index": index,
+        "ok": True,
+        "config": config,
+        "project_name": config.get("project_name", "fastapi_app"),
+        "files": result.get("files") or {},
+        "generate_s": generate_s,
+    }
+
+
+def _generate_batch_item(index: int, user_request: str) -> dict:
+    """Run the pipeline for one batch request (first phase, in a worker process).
+
+    Only the config goes back to the parent: the files are rendered again,
+    from the memo, by the worker that writes them.
+    """
+    started = time.perf_counter()
+    try:
+        state = {"user_request": user_request, "config": None, "files": None}
+        result = _worker_app.invoke(state)
+    except Exception as e:  # report per project, keep the batch going
+        return _batch_item_failure(index, e, time.perf_counter() - started)
+    item = _batch_item_generated(index, result, time.perf_counter() - started)
+    del item["files"]
+    return item
+
+
+def _write_batch_item(
+    index: int,
+    config: dict,
+    out_dir: str,
+    generate_s: float,
+    prune: bool,
+    check: bool,
+    precompile: bool,
+) -> dict:
+    """Render and write one batch project (second phase, in a worker process)."""
+    from .tools import render_project
+
+    started = time.perf_counter()
+    try:
+        return _batch_item_summary(
+            index,
+            config.get("project_name", "fastapi_app"),
+            render_project(config),
+            Path(out_dir),
+            generate_s,
+            prune,
+            check,
+            precompile,
+        )
+    except Exception as e:  # report per project, keep the batch going
+        return _batch_item_failure(index, e, generate_s + time.perf_counter() - started)
+
+
+def assign_out_dirs(project_names: Mapping[int, str], out_root: Path) -> Dict[int, Path]:
+    """Give every batch project its own directory, in request order.
+
+    A project whose snake_case name an earlier request already took gets a
+    numbered suffix (``alpha``, ``alpha_2``...), so that two projects never
+    write into the same directory and manifest.
+
+    Args:
+        project_names: Request index -> generated project name
+        out_root: Directory receiving the project directories
+    """
+    taken = set()
+    out_dirs = {}
+    for index in sorted(project_names):
+        base = name = to_snake_case(project_names[index])
+        suffix = 1
+        while name in taken:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        taken.add(name)
+        out_dirs[index] = out_root / name
+        if name != base:
+            print(f"  ⚠️  [{index}] {base} was generated by an earlier request: using {name}")
+    return out_dirs
+
+
+def _print_batch_item(summary: dict) -> None:
+    if summary["ok"]:
+        print(
+            f"  ✅ [{summary['index']}] {summary['project_name']} -> {summary['out_dir']} "
+            f"({summary['files']} files, generate {summary['generate_s']:.2f}s, "
+            f"write {summary['write_s']:.3f}s; {summary['changes']})"
+        )
+    else:
+        print(f"  ❌ [{summary['index']}] {summary['error']}")
+
+
+def _run_batch_pool(
+    requests: List[str],
+    out_root: Path,
+    jobs: Optional[int],
+    cache: Optional[ConfigCache],
+    prune: bool,
+    structured_output: bool = False,
+    check: bool = True,
+    precompile: bool = False,
+) -> List[dict]:
+    from .tools import templates
+
+    results = []
+    generated = []
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_batch_worker,
+        initargs=(cache, structured_output, templates.packs),
+    ) as pool:
+        # Project names are only known once every config is extracted: write
+        # afterwards, so that clashing names can be told apart
+        futures = [
+            pool.submit(_generate_batch_item, index, request)
+            for index, request in enumerate(requests, start=1)
+        ]
+        for future in as_completed(futures):
+            item = future.result()
+            if item["ok"]:
+                generated.append(item)
+            else:
+                results.append(item)
+                _print_batch_item(item)
+
+        out_dirs = assign_out_dirs(
+            {item["index"]: item["project_name"] for item in generated}, out_root
+        )
+        futures = [
+            pool.submit(
+                _write_batch_item,
+                item["index"],
+                item["config"],
+                str(out_dirs[item["index"]]),
+                item["generate_s"],
+                prune,
+                check,
+                precompile,
+            )
+            for item in generated
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+            _print_batch_item(results[-1])
+    return results
+
+
+async def _run_batch_async(
+    requests: List[str],
+    out_root: Path,
+    concurrency: int,
+    cache: Optional[ConfigCache],
+    prune: bool,
+    structured_output: bool = False,
+    check: bool = True,
+    precompile: bool = False,
+) -> List[dict]:
+    from .graph import build_async_app
+
+    app = build_async_app(cache=cache, structured_output=structured_output)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(index: int, user_request: str) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                state = {"user_request": user_request, "config": None, "files": None}
+                result = await app.ainvoke(state)
+            except Exception as e:  # report per project, keep the batch going
+                summary = _batch_item_failure(index, e, time.perf_counter() - started)
+                _print_batch_item(summary)
+                return summary
+        return _batch_item_generated(index, result, time.perf_counter() - started)
+
+    async def write(item: dict, out_dir: Path) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                summary = await asyncio.to_thread(
+                    _batch_item_summary,
+                    item["index"],
+                    item["project_name"],
+                    item["files"],
+                    out_dir,
+                    item["generate_s"],
+                    prune,
+                    check,
+                    precompile,
+                )
+            except Exception as e:  # report per project, keep the batch going
+                total_s = item["generate_s"] + time.perf_counter() - started
+                summary = _batch_item_failure(item["index"], e, total_s)
+        _print_batch_item(summary)
+        return summary
+
+    items = await asyncio.gather(
+        *(generate(index, request) for index, request in enumerate(requests, start=1))
+    )
+    generated = [item for item in items if item["ok"]]
+    out_dirs = assign_out_dirs(
+        {item["index"]: item["project_name"] for item in generated}, out_root
+    )
+    written = await asyncio.gather(
+        *(write(item, out_dirs[item["index"]]) for item in generated)
+    )
+    return [item for item in items if not item["ok"]] + list(written)
+
+
+def run_batch(
+    batch_path: Path,
+    out_root: Path,
+    jobs: Optional[int] = None,
+    cache: Optional[ConfigCache] = None,
+    concurrency: Optional[int] = None,
+    prune: bool = False,
+    structured_output: bool = False,
+    check: bool = True,
+    precompile: bool = False,
+) -> int:
+    """Generate every request of a batch file.
+
+    By default requests are spread across a process pool. With ``concurrency``
+    they run in this process on the async graph instead, with up to
+    ``concurrency`` LLM round trips in flight at once. Projects are written
+    once every config is known, each into its own directory (see
+    ``assign_out_dirs``).
+
+    Args:
+        batch_path: JSON Lines file of generation requests
+        out_root: Directory receiving one snake_case project directory per request
+        jobs: Number of worker processes (defaults to the CPU count)
+        cache: Config cache shared by the workers, or ``None`` to always call the LLM
+        concurrency: Run asynchronously with this many requests in flight
+        prune: Delete files that earlier runs generated but this one does not
+        structured_output: Extract configs with the model's native structured output
+        check: Compile the generated modules before writing each project
+        precompile: Also write ``__pycache__`` bytecode for each project
+
+    Returns:
+        Process exit code: 0 if every project was generated, 1 otherwise
+    """
+    try:
+        requests = read_batch(batch_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    out_root.mkdir(parents=True, exist_ok=True)
+    print(f"⏳ Generating {len(requests)} project(s) into {out_root.resolve()}...")
+
+    started = time.perf_counter()
+    if concurrency is not None:
+        results = asyncio.run(
+            _run_batch_async(
+                requests, out_root, concurrency, cache, prune, structured_output, check, precompile
+            )
+        )
+    else:
+        results = _run_batch_pool(
+            requests, out_root, jobs, cache, prune, structured_output, check, precompile
+        )
+    elapsed = time.perf_counter() - started
+
+    succeeded = [r for r in results if r["ok"]]
+
+    print("\n" + "=" * 50)
+    print(f"📝 Batch Summary: {len(succeeded)}/{len(results)} succeeded in {elapsed:.2f}s")
+    print("=" * 50)
+    return 0 if len(succeeded) == len(results) else 1
+
+
+def write_archive_output(files: Files, out: str, fmt: Optional[str], root: str) -> int:
+    """Stream a generated project into an archive file, or to stdout when ``out`` is ``-``.
+
+    Returns:
+        Number of archived files
+    """
+    from .archive import format_from_path, write_archive
+
+    if out == "-":
+        count = write_archive(files, sys.stdout.buffer, fmt=fmt or "zip", root=root)
+        sys.stdout.buffer.flush()
+        return count
+    with open(out, "wb") as handle:
+        return write_archive(files, handle, fmt=fmt or format_from_path(out), root=root)
+
+
+def run_from_config(
+    config_path: Path,
+    out_root: Path,
+    prune: bool = False,
+    out: Optional[str] = None,
+    fmt: Optional[str] = None,
+    check: bool = True,
+    precompile: bool = False,
+) -> int:
+    """Generate a project straight from a ``ProjectConfig`` JSON file, without the LLM.
+
+    Args:
+        config_path: JSON file with ``ProjectConfig`` fields
+        out_root: Directory receiving the snake_case project directory
+        prune: Delete files that earlier runs generated but this one does not
+        out: Write an archive to this path (``-`` for stdout) instead of a directory
+        fmt: Archive format, inferred from ``out`` when omitted
+        check: Compile the generated modules before writing anything
+        precompile: Also write ``__pycache__`` bytecode
+
+    Returns:
+        Process exit code
+    """
+    from pydantic import ValidationError
+
+    from .config import ProjectConfig
+    from .tools import iter_fastapi_boilerplate, render_project
+
+    try:
+        config = ProjectConfig.model_validate_json(config_path.read_text(encoding="utf-8"))
+    except OSError as e:
+        print(f"❌ Cannot read {config_path}: {e.strerror}", file=sys.stderr)
+        return 1
+    except ValidationError as e:
+        print(f"❌ {config_path} is not a valid project config:\n{e}", file=sys.stderr)
+        return 1
+
+    # The compile check needs the whole project up front; without it, files
+    # land on disk (or in the archive) as they are rendered
+    project_dir_name = to_snake_case(config.project_name)
+    if out is not None:
+        if check:
+            from .bytecode import check_project
+
+            files = render_project(config.model_dump())
+            with span("compile_check"):
+                check_project(files)
+        else:
+            files = iter_fastapi_boilerplate(config.model_dump())
+        with span("render_and_archive"):
+            count = write_archive_output(files, out, fmt, root=project_dir_name)
+        # Keep stdout clean when it carries the archive
+        print(f"✅ Archived {count} files to: {out}", file=sys.stderr)
+        return 0
+    out_dir = out_root / project_dir_name
+    if check or precompile:
+        with span("render"):
+            files = render_project(config.model_dump())
+        report = write_generated_project(
+            files, out_dir, prune=prune, check=check, precompile=precompile
+        )
+    else:
+        # Nothing to check first: stream files to disk as they are rendered
+        with span("render_and_write"):
+            files = iter_fastapi_boilerplate(config.model_dump())
+            report = write_project(files, out_dir, prune=prune)
+    print(f"✅ Successfully generated {report.total} files in: {out_dir.resolve()}")
+    print(f"   {report.summary()}")
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="fastapi-boilerplate",
+        description="Generate production-ready FastAPI projects.",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="FILE",
+        help="Generate non-interactively from a JSON Lines file of requests",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        metavar="FILE",
+        help="Generate from a ProjectConfig JSON file, skipping the LLM entirely",
+    )
+    parser.add_argument(
+        "--out-root",
+        type=Path,
+        default=Path("."),
+        metavar="DIR",
+        help="Directory receiving the generated projects with --batch/--config (default: .)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes in batch mode (default: CPU count)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Run the batch in-process on the async pipeline with up to N requests in flight",
+    )
+    parser.add_argument(
+        "--out",
+        metavar="FILE",
+        help="Write the project to a .zip/.tar.gz archive instead of a directory "
+        "('-' streams it to stdout, --config only)",
+    )
+    parser.add_argument(
+        "--format",
+        dest="archive_format",
+        choices=["zip", "tar.gz"],
+        default=None,
+        help="Archive format for --out (default: inferred from the file name, zip for stdout)",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="When regenerating, delete files the new configuration no longer produces",
+    )
+    parser.add_argument(
+        "--no-check",
+        action="store_true",
+        help="Skip compiling the generated modules before writing them",
+    )
+    parser.add_argument(
+        "--precompile",
+        action="store_true",
+        help="Write __pycache__ bytecode for the generated modules, "
+        "so the app's first start skips compilation",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always ask the LLM instead of reusing cached configurations",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Directory of the configuration cache (default: ~/.cache/fastapi-boilerplate)",
+    )
+    add_templates_argument(parser)
+    parser.add_argument(
+        "--structured-output",
+        action="store_true",
+        help="Extract the configuration with the model's native structured output "
+        "(shorter prompt, schema enforced by the API)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the time spent in each pipeline node and phase, and LLM token usage",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Export a timing trace: JSON Lines for .jsonl files, Chrome trace format otherwise",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help="Profile the whole run with cProfile: pstats to FILE, collapsed stacks "
+        "for flame graphs to FILE with .collapsed appended",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Number of hot functions listed after a --profile run (default: 20)",
+    )
+    args = parser.parse_args(argv)
+    if args.batch is not None and args.config is not None:
+        parser.error("--batch and --config are mutually exclusive")
+    if args.out is not None:
+        if args.precompile:
+            parser.error("--precompile needs a project directory; it cannot be used with --out")
+        if args.batch is not None:
+            parser.error("--out is not supported with --batch")
+        if args.out == "-" and args.config is None:
+            parser.error("--out - requires --config (the interactive prompts use stdout)")
+        if args.out != "-" and args.archive_format is None:
+            from .archive import format_from_path
+
+            try:
+                format_from_path(args.out)
+            except ValueError as e:
+                parser.error(str(e))
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.profile_top < 1:
+        parser.error("--profile-top must be at least 1")
+    if (args.timings or args.trace) and args.batch is not None and args.concurrency is None:
+        parser.error("--timings/--trace with --batch require --concurrency (in-process runs)")
+    return args
+
+
+def run_interactive(
+    cache: Optional[ConfigCache] = None,
+    prune: bool = False,
+    out: Optional[str] = None,
+    fmt: Optional[str] = None,
+    structured_output: bool = False,
+    check: bool = True,
+    precompile: bool = False,
+):
     print("🚀 FastAPI Boilerplate Generator")
     print("=" * 50)
     print()
@@ -42,6 +679,8 @@ def main():
     print("  2. SQLite (good for development)")
     db_choice = get_user_input("Choose database [1/2]", "1")
     db = "postgres" if db_choice == "1" else "sqlite"
+    async_db = get_yes_no("\nUse async SQLAlchemy (asyncpg/aiosqlite)?", False)
+    service_cache = get_yes_no("\nCache reads in a read-through service cache?", False)
     
     include_docker = get_yes_no("\nInclude Docker support?", True)
     
@@ -55,15 +694,23 @@ def main():
     
     # Build natural language request
     db_name = "PostgreSQL" if db == "postgres" else "SQLite"
-    ci_name = {"github": "GitHub Actions", "gitlab": "GitLab CI", "none": "no CI/CD"}.get(ci, "GitHub Actions")
-    docker_text = "Docker and " if include_docker else ""
+    if async_db:
+        db_name += " (async)"
+    ci_names = {"github": "GitHub Actions", "gitlab": "GitLab CI", "none": "no CI/CD"}
+    ci_name = ci_names.get(ci, "GitHub Actions")
+    docker_text = "Docker and " if include_docker else "no Docker and "
+    cache_text = "a service cache, " if service_cache else ""
     
-    user_request = f"Generate a FastAPI backend called '{project_name}' with {db_name}, {docker_text}{ci_name}."
+    user_request = (
+        f"Generate a FastAPI backend called '{project_name}' with {db_name}, "
+        f"{cache_text}{docker_text}{ci_name}."
+    )
     
     print("\n" + "=" * 50)
     print("📝 Configuration Summary:")
     print(f"  • Project: {project_name}")
     print(f"  • Database: {db_name}")
+    print(f"  • Service cache: {'Yes' if service_cache else 'No'}")
     print(f"  • Docker: {'Yes' if include_docker else 'No'}")
     print(f"  • CI/CD: {ci_name}")
     print("=" * 50)
@@ -77,7 +724,9 @@ def main():
     print("\n⏳ Generating project...")
     
     # Generate the project
-    app = build_app()
+    from .graph import build_app
+
+    app = build_app(cache=cache, structured_output=structured_output)
     state = {"user_request": user_request, "config": None, "files": None}
     result = app.invoke(state)
 
@@ -85,15 +734,24 @@ def main():
     
     # Use project name in snake_case for output directory
     project_dir_name = to_snake_case(project_name)
-    out_dir = Path(project_dir_name)
-    out_dir.mkdir(exist_ok=True)
+    if out is not None:
+        if check:
+            from .bytecode import check_project
+
+            with span("compile_check"):
+                check_project(files)
+        with span("archive", files=len(files)):
+            count = write_archive_output(files, out, fmt, root=project_dir_name)
+        print(f"\n✅ Successfully archived {count} files to: {Path(out).resolve()}")
+        return
 
-    for path, content in files.items():
-        file_path = out_dir / path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content, encoding="utf-8")
+    out_dir = Path(project_dir_name)
+    report = write_generated_project(
+        files, out_dir, prune=prune, check=check, precompile=precompile
+    )
 
     print(f"\n✅ Successfully generated project in: {out_dir.resolve()}")
+    print(f"   {report.summary()}")
     print("\n📖 Next steps:")
     print(f"  1. cd {project_dir_name}")
     print("  2. make install")
@@ -101,5 +759,167 @@ def main():
     print("\n💡 See README.md for more details!")
 
 
+def parse_serve_args(argv: List[str]) -> argparse.Namespace:
+    """Parse the arguments of ``fastapi-boilerplate serve``."""
+    parser = argparse.ArgumentParser(
+        prog="fastapi-boilerplate serve",
+        description="Serve project generation over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port (default: 8000)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always ask the LLM instead of reusing cached configurations",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Directory of the configuration cache (default: ~/.cache/fastapi-boilerplate)",
+    )
+    add_templates_argument(parser)
+    parser.add_argument(
+        "--structured-output",
+        action="store_true",
+        help="Extract the configuration with the model's native structured output",
+    )
+    return parser.parse_args(argv)
+
+
+def add_templates_argument(parser: argparse.ArgumentParser) -> None:
+    """Add ``--templates``, shared by the generation and ``serve`` commands."""
+    parser.add_argument(
+        "--templates",
+        type=Path,
+        action="append",
+        default=None,
+        metavar="DIR",
+        help="Template pack overriding the bundled templates; repeatable, later packs win "
+        "(default: $FASTAPI_BOILERPLATE_TEMPLATES)",
+    )
+
+
+def use_template_packs(directories: Optional[List[Path]]) -> bool:
+    """Apply the ``--templates`` packs, or check the ones from the environment.
+
+    Reports and returns False if a pack is invalid, so that a bad
+    ``$FASTAPI_BOILERPLATE_TEMPLATES`` fails before any work starts.
+    """
+    from .tools import templates
+
+    try:
+        if directories:
+            templates.set_packs(directories)
+        else:
+            templates.packs  # loads and checks the packs named by the environment
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        from .server import serve
+
+        serve_args = parse_serve_args(argv[1:])
+        if not use_template_packs(serve_args.templates):
+            return 1
+        cache = None if serve_args.no_cache else ConfigCache(serve_args.cache_dir)
+        return serve(
+            serve_args.host,
+            serve_args.port,
+            cache=cache,
+            structured_output=serve_args.structured_output,
+        )
+
+    args = parse_args(argv)
+    if args.profile is None:
+        return execute(args)
+
+    from .profiling import profiling
+
+    # Everything below is profiled, including the lazy LangChain/LangGraph imports
+    with profiling(args.profile, top=args.profile_top):
+        return execute(args)
+
+
+def execute(args: argparse.Namespace):
+    """Run parsed command-line arguments, reporting timings and compile errors."""
+    if not use_template_packs(args.templates):
+        return 1
+    try:
+        if not (args.timings or args.trace):
+            return run(args)
+
+        with tracing() as tracer:
+            with span("total", "run"):
+                exit_code = run(args)
+    except SyntaxError as e:
+        print(
+            f"❌ Generated code does not compile: {e.filename}:{e.lineno}: {e.msg}",
+            file=sys.stderr,
+        )
+        return 1
+    report_timings(tracer, args)
+    return exit_code
+
+
+def report_timings(tracer: Tracer, args: argparse.Namespace) -> None:
+    """Print the timing summary and/or export the trace, as requested."""
+    if args.timings:
+        from .tools import render_cache_info
+
+        render_cache = render_cache_info()
+        # stderr, so that an archive streamed to stdout stays intact
+        print("\n⏱️  Timings\n" + tracer.summary(), file=sys.stderr)
+        print(
+            f"Render cache: {render_cache.hits} hits, {render_cache.misses} misses",
+            file=sys.stderr,
+        )
+    if args.trace:
+        tracer.export(args.trace)
+        print(f"📈 Trace written to: {args.trace}", file=sys.stderr)
+
+
+def run(args: argparse.Namespace):
+    """Dispatch parsed command-line arguments to the matching run mode."""
+    if args.config is not None:
+        return run_from_config(
+            args.config,
+            args.out_root,
+            prune=args.prune,
+            out=args.out,
+            fmt=args.archive_format,
+            check=not args.no_check,
+            precompile=args.precompile,
+        )
+    cache = None if args.no_cache else ConfigCache(args.cache_dir)
+    if args.batch is not None:
+        return run_batch(
+            args.batch,
+            args.out_root,
+            args.jobs,
+            cache=cache,
+            concurrency=args.concurrency,
+            prune=args.prune,
+            structured_output=args.structured_output,
+            check=not args.no_check,
+            precompile=args.precompile,
+        )
+    run_interactive(
+        cache=cache,
+        prune=args.prune,
+        out=args.out,
+        fmt=args.archive_format,
+        structured_output=args.structured_output,
+        check=not args.no_check,
+        precompile=args.precompile,
+    )
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,5 +1,5 @@
-from typing import Literal
-from pydantic import BaseModel
+from typing import List, Literal
+from pydantic import BaseModel, Field, field_validator
 
 
 class ProjectConfig(BaseModel):
@@ -14,3 +14,23 @@ class ProjectConfig(BaseModel):
     auth_enabled: bool = True
     docker: bool = True
     ci: Literal["gitlab", "github", "none"] = "github"
+    # Resources to generate a domain module for (e.g. ["user", "order"]);
+    # empty means a single module named after the project
+    entities: List[str] = Field(default_factory=list)
+    # Generate an asyncio stack (create_async_engine, AsyncSession, async
+    # repositories/services/routes) instead of the sync one
+    async_db: bool = False
+    # List endpoints page with an opaque (created_at, id) cursor; "offset"
+    # keeps the former skip/limit paging
+    pagination: Literal["cursor", "offset"] = "cursor"
+    # Read single items through a read-through cache (in-process LRU with a
+    # TTL, or Redis) that updates and deletes invalidate
+    service_cache: bool = False
+
+    @field_validator("entities")
+    @classmethod
+    def check_entities(cls, entities: List[str]) -> List[str]:
+        from .tools import entity_names
+
+        entity_names(entities)  # raises ValueError on invalid or colliding names
+        return entities
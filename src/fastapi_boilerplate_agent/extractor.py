@@ -0,0 +1,259 @@
+"""Deterministic, rule-based config extraction for well-formed requests.
+
+Requests such as the one assembled by the interactive CLI
+("Generate a FastAPI backend called 'shop' with PostgreSQL, Docker and
+GitHub Actions.") or ``examples/sample_request.txt`` state every option
+explicitly. Parsing them with a few regular expressions takes microseconds,
+so the graph only falls back to the LLM when the extraction is not confident.
+"""
+
+import json
+import re
+from typing import Optional, Tuple
+
+from .config import ProjectConfig
+
+# Fields that must be stated explicitly for the fast path to be trusted
+REQUIRED_FIELDS = ("project_name", "db", "ci")
+MIN_CONFIDENCE = 1.0
+
+# "no Docker", "without auth", "do not use Docker", "don't want a service cache",
+# "without Docker or CI"...
+_NEGATION = (
+    r"(?:no|not|never|neither|without|skip|exclude|excluding|don['’]t)\s+"
+    r"(?:(?:use|using|need|want|include|including|add)\s+)?(?:an?\s+|any\s+)?"
+    r"(?:[\w/-]+\s+(?:or|nor)\s+)*"
+)
+# "Docker is not needed", "auth isn't required", "Docker or CI not wanted"...
+_NEGATED_AFTER = (
+    r"(?:\s+(?:or|nor)\s+[\w/-]+)*\s+(?:(?:is|are)\s+)?(?:not|never|isn['’]t|aren['’]t)\b"
+)
+# Any negation at all: a clause holding one that neither pattern explains is
+# left to the LLM
+_ANY_NEGATION = re.compile(
+    r"\b(?:no|not|never|neither|nor|without|skip|exclude|excluding)\b|n['’]t\b", re.IGNORECASE
+)
+# Options are read clause by clause: "with SQLite, no Docker and GitHub Actions"
+_CLAUSE_BREAK = re.compile(r"[,;.!?]|\b(?:and|but|with)\b", re.IGNORECASE)
+# "Docker and auth are not needed" negates more than its own clause
+_PLURAL_NEGATION = re.compile(r"\b(?:are\s+not|aren['’]t)\b", re.IGNORECASE)
+_SENTENCE_BREAK = re.compile(r"[.;!?]")
+
+# Words that name a technology rather than the project: "a backend for Postgres"
+_OPTION_WORDS = (
+    r"(?i:postgres(?:ql)?|psql|sqlite3?|docker|github|gitlab|ci|fastapi|auth\w*|async\w*)\b"
+)
+
+_NAME_PATTERNS = (
+    # The closing quote ends a word: 'bob's app' keeps its apostrophe
+    re.compile(r"\b(?:called|named)\s+(['\"`])(?P<name>.+?)\1(?!\w)", re.IGNORECASE),
+    re.compile(r"\b(?:called|named)\s+(?P<name>[A-Za-z][\w-]*)", re.IGNORECASE),
+    re.compile(rf"\bfor\s+(?:an?\s+|the\s+)?(?!{_OPTION_WORDS})(?P<name>[A-Z][\w-]*)"),
+)
+
+_POSTGRES = re.compile(r"\b(?:postgres(?:ql)?|psql)\b", re.IGNORECASE)
+_SQLITE = re.compile(r"\bsqlite3?\b", re.IGNORECASE)
+
+_DOCKER = r"docker"
+_AUTH = r"(?:auth|authentication|authorization|login)"
+_GITHUB = r"github"
+_GITLAB = r"gitlab"
+_CI = r"(?:ci(?:/cd)?|continuous integration)(?![\w/])"
+_ASYNC = r"(?:async|asyncio|asynchronous)"
+_SERVICE_CACHE = r"(?:service|read-through|response)\s+cach(?:e|ing)"
+
+# Requests listing resources are left to the LLM, which fills ``entities``
+_ENTITIES = re.compile(r"\b(?:entit(?:y|ies)|resources?)\b", re.IGNORECASE)
+
+_OFFSET_PAGINATION = re.compile(r"\b(?:offset|skip/limit)\s+pagination\b", re.IGNORECASE)
+
+# A clause negating none of these leaves its sentence to the LLM ("Docker, maybe not")
+_ANY_OPTION = re.compile(
+    rf"\b(?:{_DOCKER}|{_AUTH}|{_GITHUB}|{_GITLAB}|{_CI}|{_ASYNC}|{_SERVICE_CACHE}"
+    r"|postgres(?:ql)?|psql|sqlite3?)\b",
+    re.IGNORECASE,
+)
+
+# Result of _option() when an option is mentioned in a way the rules cannot read
+_UNCLEAR = "unclear"
+
+
+# Lenient spellings accepted when repairing an LLM reply (see repair_config)
+_FIELD_ALIASES = {
+    "name": "project_name",
+    "project": "project_name",
+    "database": "db",
+    "auth": "auth_enabled",
+    "authentication": "auth_enabled",
+    "ci_cd": "ci",
+    "async": "async_db",
+    "asyncio": "async_db",
+    "cache": "service_cache",
+}
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_TRUE_WORDS = {"true", "yes", "y", "1", "on", "enabled"}
+_FALSE_WORDS = {"false", "no", "n", "0", "off", "disabled"}
+_NO_CI_WORDS = {"", "none", "no", "false", "off", "disabled"}
+
+
+def _extract_name(text: str) -> Tuple[Optional[str], str]:
+    """Return the project name and the request without it."""
+    for pattern in _NAME_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group("name").strip(), text[: match.start()] + text[match.end():]
+    return None, text
+
+
+def _option(text: str, keyword: str):
+    """Read an option from the clauses that mention it.
+
+    Returns:
+        ``True`` if requested, ``False`` if declined, ``None`` if never
+        mentioned, ``_UNCLEAR`` if mentioned both ways or in a sentence with
+        a negation neither rule explains
+    """
+    mention = re.compile(rf"\b{keyword}\b", re.IGNORECASE)
+    declined = re.compile(
+        rf"\b{_NEGATION}{keyword}\b|\b{keyword}{_NEGATED_AFTER}", re.IGNORECASE
+    )
+    states = set()
+    for sentence in _SENTENCE_BREAK.split(text):
+        if not mention.search(sentence):
+            continue
+        clauses = _CLAUSE_BREAK.split(sentence)
+        if _PLURAL_NEGATION.search(sentence) or any(
+            _ANY_NEGATION.search(clause) and not _ANY_OPTION.search(clause) for clause in clauses
+        ):
+            return _UNCLEAR
+        for clause in clauses:
+            if declined.search(clause):
+                states.add(False)
+            elif mention.search(clause):
+                states.add(_UNCLEAR if _ANY_NEGATION.search(clause) else True)
+    if not states:
+        return None
+    return states.pop() if len(states) == 1 else _UNCLEAR
+
+
+def _extract_db(text: str) -> Optional[str]:
+    postgres = bool(_POSTGRES.search(text))
+    sqlite = bool(_SQLITE.search(text))
+    if postgres == sqlite:  # neither, or ambiguous
+        return None
+    return "postgres" if postgres else "sqlite"
+
+
+def _extract_ci(text: str) -> Optional[str]:
+    github, gitlab, ci = (_option(text, keyword) for keyword in (_GITHUB, _GITLAB, _CI))
+    if _UNCLEAR in (github, gitlab, ci):
+        return None
+    found = {name for name, state in (("github", github), ("gitlab", gitlab)) if state}
+    if ci is False:
+        found.add("none")
+    return found.pop() if len(found) == 1 else None
+
+
+def extract_config(user_request: str) -> Tuple[Optional[dict], float]:
+    """Extract a ``ProjectConfig`` from a request without calling the LLM.
+
+    Args:
+        user_request: Natural language generation request
+
+    Returns:
+        ``(config, confidence)``. ``confidence`` is the share of
+        ``REQUIRED_FIELDS`` and mentioned options read unambiguously;
+        ``config`` is ``None`` unless it reaches ``MIN_CONFIDENCE``. Requests
+        that mention entities or resources always go to the LLM (confidence 0).
+    """
+    text = " ".join(user_request.split())
+    if _ENTITIES.search(text):
+        return None, 0.0
+    name, text = _extract_name(text)
+    values = {"project_name": name, "db": _extract_db(text), "ci": _extract_ci(text)}
+    # Unmentioned options keep the ProjectConfig defaults, as the LLM would:
+    # Docker and auth are on unless declined, the async stack and the
+    # service cache off unless asked for.
+    options = {
+        "docker": _option(text, _DOCKER),
+        "auth_enabled": _option(text, _AUTH),
+        "async_db": _option(text, _ASYNC),
+        "service_cache": _option(text, _SERVICE_CACHE),
+    }
+    mentioned = {field: state for field, state in options.items() if state is not None}
+    read = sum(values[field] is not None for field in REQUIRED_FIELDS) + sum(
+        state is not _UNCLEAR for state in mentioned.values()
+    )
+    confidence = read / (len(REQUIRED_FIELDS) + len(mentioned))
+    if confidence < MIN_CONFIDENCE:
+        return None, confidence
+
+    values.update(mentioned)
+    if _OFFSET_PAGINATION.search(text):
+        values["pagination"] = "offset"
+    return ProjectConfig(**values).model_dump(), confidence
+
+
+def _load_object(payload) -> Optional[dict]:
+    """Return the JSON object in a reply, ignoring code fences and surrounding prose."""
+    if isinstance(payload, dict):
+        return payload
+    if not isinstance(payload, str):
+        return None
+    match = _JSON_OBJECT.search(payload)
+    if match is None:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _coerce_bool(value):
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in _TRUE_WORDS:
+            return True
+        if word in _FALSE_WORDS:
+            return False
+    return value
+
+
+def repair_config(payload) -> Optional[ProjectConfig]:
+    """Fix an LLM reply that does not match ``ProjectConfig``, without another LLM call.
+
+    Handles the usual near misses: JSON wrapped in code fences or prose,
+    aliased or differently cased keys, spelled-out databases and CI systems
+    ("PostgreSQL", "GitHub Actions", ``null``) and yes/no strings for booleans.
+
+    Args:
+        payload: The reply text, or the arguments of a tool call
+
+    Returns:
+        The repaired config, or ``None`` if the reply cannot be salvaged
+    """
+    data = _load_object(payload)
+    if data is None:
+        return None
+    values = {}
+    for key, value in data.items():
+        key = str(key).strip().lower().replace(" ", "_").replace("-", "_").replace("/", "_")
+        values[_FIELD_ALIASES.get(key, key)] = value
+
+    if isinstance(values.get("db"), str):
+        values["db"] = _extract_db(values["db"]) or values["db"]
+    if "ci" in values:
+        ci = values["ci"]
+        if isinstance(ci, str) and ci.strip().lower() in _NO_CI_WORDS or ci in (None, False):
+            values["ci"] = "none"
+        elif isinstance(ci, str):
+            values["ci"] = _extract_ci(ci) or ci
+    for field in ("docker", "auth_enabled", "async_db", "service_cache"):
+        if field in values:
+            values[field] = _coerce_bool(values[field])
+
+    try:
+        return ProjectConfig(**values)
+    except (TypeError, ValueError):  # pydantic's ValidationError is a ValueError
+        return None
@@ -1,27 +1,42 @@
-from typing import Optional, Dict
+import asyncio
+import json
+from functools import partial
+from typing import Callable, List, Mapping, Optional, Tuple
 from dotenv import load_dotenv
 
 from typing_extensions import TypedDict
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
+from .cache import ConfigCache
 from .config import ProjectConfig
-from .tools import generate_fastapi_boilerplate_func
-
-# Load environment variables from .env file
-load_dotenv()
+from .extractor import extract_config, repair_config
+from .tools import render_project
+from .tracing import record_usage, span
 
 
 class State(TypedDict):
     user_request: str
     config: Optional[dict]
-    files: Optional[Dict[str, str]]
+    files: Optional[Mapping[str, str]]
+
+
+MODEL_NAME = "gpt-4o-mini"
+
+# Bump whenever the prompts below change, so cached configs are not reused
+PROMPT_VERSION = "5"
+STRUCTURED_PROMPT_VERSION = "structured-5"
+
+# Default number of requests whose LLM calls may overlap in an async batch
+DEFAULT_MAX_CONCURRENCY = 8
 
+# Created on first use by get_llm(), so importing this module stays cheap
+llm = None
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+# (llm, llm bound to ProjectConfig) built by get_structured_llm()
+_structured_llm = None
 
 parser = PydanticOutputParser(pydantic_object=ProjectConfig)
 
@@ -35,38 +50,310 @@ prompt = ChatPromptTemplate.from_messages(
             "- db: either 'postgres' or 'sqlite' (default: 'postgres')\n"
             "- auth_enabled: boolean (default: true)\n"
             "- docker: boolean (default: true)\n"
-            "- ci: either 'gitlab', 'github', or 'none' (default: 'github')\n\n"
+            "- ci: either 'gitlab', 'github', or 'none' (default: 'github')\n"
+            "- entities: list of resource names, one module each (default: [])\n"
+            "- async_db: boolean, async SQLAlchemy stack (default: false)\n"
+            "- pagination: either 'cursor' or 'offset' (default: 'cursor')\n"
+            "- service_cache: boolean, read-through cache for services (default: false)\n\n"
             "Respond ONLY with valid JSON matching this schema. "
-            "Use simple boolean values for docker and auth_enabled fields.",
+            "Use simple boolean values for docker, auth_enabled, async_db and service_cache.",
+        ),
+        ("human", "{user_request}"),
+    ]
+)
+
+# Structured-output mode: the schema travels as the model's native response
+# format / tool definition, so the instructions can stay short
+structured_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "Extract the FastAPI project configuration from the user request. "
+            "Use the defaults for options the request does not mention.",
         ),
         ("human", "{user_request}"),
     ]
 )
 
+# Sent once when a reply fails validation, instead of re-running the request
+repair_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "Your configuration failed validation. Return it corrected.{format_instructions}",
+        ),
+        ("human", "Configuration:\n{reply}\n\nValidation error:\n{error}"),
+    ]
+)
+REPAIR_FORMAT_INSTRUCTIONS = (
+    " Respond ONLY with JSON: project_name (string), db ('postgres' or 'sqlite'), "
+    "auth_enabled (boolean), docker (boolean), ci ('gitlab', 'github' or 'none'), "
+    "entities (list of strings), async_db (boolean), pagination ('cursor' or 'offset'), "
+    "service_cache (boolean)."
+)
+
+
+def get_llm():
+    """Return the chat model, creating it on first use."""
+    global llm
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+
+        # Load environment variables from .env file
+        load_dotenv()
+        llm = ChatOpenAI(model=MODEL_NAME)
+    return llm
+
+
+def get_structured_llm():
+    """Return the chat model bound to ``ProjectConfig`` through native structured output.
+
+    The runnable returns ``{"raw", "parsed", "parsing_error"}`` instead of
+    raising, so that a malformed reply can be repaired.
+    """
+    global _structured_llm
+    base = get_llm()
+    if _structured_llm is None or _structured_llm[0] is not base:
+        _structured_llm = (base, base.with_structured_output(ProjectConfig, include_raw=True))
+    return _structured_llm[1]
+
+
+def _cached_config(user_request: str, cache: Optional[ConfigCache], structured_output: bool):
+    """Return ``(key, cached config dict or None)`` for a request."""
+    if cache is None:
+        return None, None
+    prompt_version = STRUCTURED_PROMPT_VERSION if structured_output else PROMPT_VERSION
+    with span("cache_lookup") as args:
+        key = cache.make_key(user_request, MODEL_NAME, prompt_version)
+        cached = cache.get(key)
+        args["hit"] = cached is not None
+    return key, (cached.model_dump() if cached is not None else None)
+
+
+def _extraction_model(structured_output: bool):
+    return get_structured_llm() if structured_output else get_llm()
+
+
+def _extraction_messages(user_request: str, structured_output: bool):
+    template = structured_prompt if structured_output else prompt
+    return template.format_messages(user_request=user_request)
+
+
+def _repair_messages(reply, error: Exception, structured_output: bool):
+    if not isinstance(reply, str):
+        reply = json.dumps(reply)
+    return repair_prompt.format_messages(
+        reply=reply,
+        error=str(error),
+        format_instructions="" if structured_output else REPAIR_FORMAT_INSTRUCTIONS,
+    )
+
+
+def _response_message(result, structured_output: bool):
+    """The AI message of a model result (it carries the token usage)."""
+    return result["raw"] if structured_output else result
 
-def to_config_dict(user_request: str) -> dict:
-    msg = prompt.format_messages(user_request=user_request)
-    result = llm.invoke(msg)
-    config = parser.parse(result.content)
-    return config.dict()
 
+def _validate(result, structured_output: bool) -> Tuple[Optional[ProjectConfig], object, Exception]:
+    """Turn a model result into a config, fixing near misses locally.
 
-def build_config(state: State) -> State:
-    config = to_config_dict(state["user_request"])
+    Returns:
+        ``(config, reply, error)``: ``config`` is ``None`` when the reply
+        could not be salvaged, in which case ``reply`` and ``error`` describe
+        what to send back to the model
+    """
+    with span("parse"):
+        if structured_output:
+            if result["parsed"] is not None:
+                return result["parsed"], None, None
+            raw, error = result["raw"], result["parsing_error"]
+            reply = raw.tool_calls[0]["args"] if raw.tool_calls else raw.content
+        else:
+            reply = result.content
+            try:
+                return parser.parse(reply), None, None
+            except OutputParserException as e:
+                error = e
+        return repair_config(reply), reply, error
+
+
+def _validated_or_raise(result, structured_output: bool) -> ProjectConfig:
+    config, reply, error = _validate(result, structured_output)
+    if config is None:
+        raise OutputParserException(
+            f"LLM reply does not match ProjectConfig after a repair attempt: {error}",
+            llm_output=str(reply),
+        )
+    return config
+
+
+def _store(config: ProjectConfig, key: Optional[str], cache: Optional[ConfigCache]) -> dict:
+    if cache is not None:
+        with span("cache_store"):
+            cache.put(key, config)
+    return config.model_dump()
+
+
+def to_config_dict(
+    user_request: str, cache: Optional[ConfigCache] = None, structured_output: bool = False
+) -> dict:
+    """Ask the LLM for the config of a request.
+
+    A reply that fails validation is first repaired locally, then sent back
+    to the model once together with the validation error.
+
+    Args:
+        user_request: Natural language generation request
+        cache: Optional config cache
+        structured_output: Bind the model to ``ProjectConfig`` through its
+            native structured output instead of parsing free text
+
+    Raises:
+        OutputParserException: If the reply is still invalid after the repair step
+    """
+    key, cached = _cached_config(user_request, cache, structured_output)
+    if cached is not None:
+        return cached
+
+    model = _extraction_model(structured_output)
+    with span("llm_call", model=MODEL_NAME) as args:
+        result = model.invoke(_extraction_messages(user_request, structured_output))
+        args.update(record_usage(_response_message(result, structured_output)))
+    config, reply, error = _validate(result, structured_output)
+
+    if config is None:
+        with span("llm_repair", model=MODEL_NAME) as args:
+            result = model.invoke(_repair_messages(reply, error, structured_output))
+            args.update(record_usage(_response_message(result, structured_output)))
+        config = _validated_or_raise(result, structured_output)
+    return _store(config, key, cache)
+
+
+async def ato_config_dict(
+    user_request: str, cache: Optional[ConfigCache] = None, structured_output: bool = False
+) -> dict:
+    """Async variant of ``to_config_dict`` built on ``ainvoke``.
+
+    Cache reads and writes touch the disk, so they run in a worker thread
+    instead of blocking the event loop.
+    """
+    key, cached = None, None
+    if cache is not None:
+        key, cached = await asyncio.to_thread(
+            _cached_config, user_request, cache, structured_output
+        )
+    if cached is not None:
+        return cached
+
+    model = _extraction_model(structured_output)
+    with span("llm_call", model=MODEL_NAME) as args:
+        result = await model.ainvoke(_extraction_messages(user_request, structured_output))
+        args.update(record_usage(_response_message(result, structured_output)))
+    config, reply, error = _validate(result, structured_output)
+
+    if config is None:
+        with span("llm_repair", model=MODEL_NAME) as args:
+            result = await model.ainvoke(_repair_messages(reply, error, structured_output))
+            args.update(record_usage(_response_message(result, structured_output)))
+        config = _validated_or_raise(result, structured_output)
+    if cache is None:
+        return config.model_dump()
+    return await asyncio.to_thread(_store, config, key, cache)
+
+
+def fast_extract(state: State) -> State:
+    """Parse well-formed requests without the LLM (see extractor.py)."""
+    with span("fast_extract", "node") as args:
+        config, args["confidence"] = extract_config(state["user_request"])
+    return {**state, "config": config}
+
+
+def route_after_extract(state: State) -> str:
+    """Skip the LLM when the fast path produced a config."""
+    return "generate_code" if state.get("config") else "build_config"
+
+
+def build_config(
+    state: State, cache: Optional[ConfigCache] = None, structured_output: bool = False
+) -> State:
+    with span("build_config", "node"):
+        config = to_config_dict(
+            state["user_request"], cache=cache, structured_output=structured_output
+        )
+    return {**state, "config": config}
+
+
+async def abuild_config(
+    state: State, cache: Optional[ConfigCache] = None, structured_output: bool = False
+) -> State:
+    with span("build_config", "node"):
+        config = await ato_config_dict(
+            state["user_request"], cache=cache, structured_output=structured_output
+        )
     return {**state, "config": config}
 
 
 def generate_code(state: State) -> State:
-    files = generate_fastapi_boilerplate_func(state["config"])
+    with span("generate_code", "node") as args:
+        files = render_project(state["config"])
+        args["files"] = len(files)
     return {**state, "files": files}
 
 
-def build_app():
+async def agenerate_code(state: State) -> State:
+    # Rendering is CPU-bound and takes well under a millisecond
+    return generate_code(state)
+
+
+def build_app(cache: Optional[ConfigCache] = None, structured_output: bool = False):
+    node = partial(build_config, cache=cache, structured_output=structured_output)
+    with span("compile_graph"):
+        return _compile_graph(node, generate_code)
+
+
+def build_async_app(cache: Optional[ConfigCache] = None, structured_output: bool = False):
+    """Compile the graph with async nodes, to be driven with ``ainvoke``/``abatch``."""
+    node = partial(abuild_config, cache=cache, structured_output=structured_output)
+    with span("compile_graph"):
+        return _compile_graph(node, agenerate_code)
+
+
+async def agenerate_batch(
+    user_requests: List[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: Optional[ConfigCache] = None,
+    app=None,
+    structured_output: bool = False,
+) -> List:
+    """Run many requests concurrently, overlapping their LLM round trips.
+
+    Args:
+        user_requests: Natural language generation requests
+        max_concurrency: Maximum number of requests in flight at once
+        cache: Optional config cache
+        app: A graph from ``build_async_app`` to reuse (compiled on demand otherwise)
+        structured_output: Use native structured output when compiling the graph
+
+    Returns:
+        One final state per request, in order; failed requests yield their exception.
+    """
+    app = app or build_async_app(cache=cache, structured_output=structured_output)
+    states = [{"user_request": request, "config": None, "files": None} for request in user_requests]
+    return await app.abatch(
+        states, config={"max_concurrency": max_concurrency}, return_exceptions=True
+    )
+
+
+def _compile_graph(build_config_node: Callable, generate_code_node: Callable):
     graph = StateGraph(State)
-    graph.add_node("build_config", build_config)
-    graph.add_node("generate_code", generate_code)
+    graph.add_node("fast_extract", fast_extract)
+    graph.add_node("build_config", build_config_node)
+    graph.add_node("generate_code", generate_code_node)
 
-    graph.set_entry_point("build_config")
+    graph.set_entry_point("fast_extract")
+    graph.add_conditional_edges(
+        "fast_extract", route_after_extract, ["build_config", "generate_code"]
+    )
     graph.add_edge("build_config", "generate_code")
     graph.add_edge("generate_code", END)
 
@@ -0,0 +1,132 @@
+"""cProfile capture of a whole generator run (``fastapi-boilerplate --profile``).
+
+The profile is written in the ``pstats`` format (``python -m pstats FILE``,
+snakeviz...) and as collapsed stacks, one ``frame;frame;frame weight`` line
+per call path, which ``flamegraph.pl``, speedscope or inferno render as a
+flame graph.
+
+cProfile only records caller -> callee edges, not whole stacks, so the
+collapsed stacks are reconstructed from the call graph: the time a function
+spends when called from a given caller is split across its callees in
+proportion to their cumulative time. This is exact for tree-shaped call
+graphs and a close approximation otherwise; recursive calls (the import
+machinery, for one) are folded into their outermost frame. The pstats dump
+keeps the exact per-function figures.
+"""
+
+import cProfile
+import pstats
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+# Number of functions listed when a profiled run exits
+PROFILE_TOP = 20
+
+# Call paths worth less than this fraction of the run are folded into their
+# caller: far too narrow to show in a flame graph, and they would multiply the
+# output size (the import machinery alone yields hundreds of thousands)
+MIN_PATH_FRACTION = 1e-4
+
+Function = Tuple[str, int, str]
+
+
+def function_label(function: Function) -> str:
+    """Short ``package/module.py:name:line`` label of a pstats function key."""
+    filename, lineno, name = function
+    if filename == "~":  # built-in functions
+        return name.replace(";", ",")
+    location = "/".join(Path(filename).parts[-2:])
+    return f"{location}:{name}:{lineno}".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """Reconstruct collapsed stacks (path -> microseconds of self time) from ``stats``."""
+    callees: Dict[Function, List[Tuple[Function, float]]] = {}
+    roots = []
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+
+    min_path_us = stats.total_tt * 1e6 * MIN_PATH_FRACTION
+    stacks: Dict[str, int] = {}
+    # (function, microseconds spent in it on this path, path labels, functions on the path)
+    pending = [
+        (root, stats.stats[root][3] * 1e6, (function_label(root),), frozenset([root]))
+        for root in roots
+    ]
+    while pending:
+        function, path_us, labels, on_path = pending.pop()
+        _, _, own, cumulative, _ = stats.stats[function]
+        share = path_us / (cumulative * 1e6) if cumulative else 0.0
+        self_us = own * 1e6 * share
+        children = callees.get(function, ())
+        # With recursion, the per-caller cumulative times overlap; scale them
+        # down so that a frame never hands out more time than it has
+        children_total = sum(edge_cumulative for _, edge_cumulative in children)
+        if own + children_total > cumulative and children_total:
+            share *= max(cumulative - own, 0.0) / children_total
+        for callee, edge_cumulative in children:
+            callee_us = edge_cumulative * 1e6 * share
+            if callee in on_path or callee_us < min_path_us:
+                # Recursive or too small to show: keep the time on this frame
+                self_us += callee_us
+                continue
+            pending.append(
+                (callee, callee_us, labels + (function_label(callee),), on_path | {callee})
+            )
+        weight = round(self_us)
+        if weight > 0:
+            key = ";".join(labels)
+            stacks[key] = stacks.get(key, 0) + weight
+    return stacks
+
+
+def write_collapsed(stats: pstats.Stats, path: Union[str, Path]) -> None:
+    """Write ``stats`` as collapsed stacks, weighted in microseconds."""
+    with open(path, "w", encoding="utf-8") as handle:
+        for stack, weight in sorted(collapsed_stacks(stats).items()):
+            handle.write(f"{stack} {weight}\n")
+
+
+def top_functions(stats: pstats.Stats, top: int = PROFILE_TOP) -> str:
+    """Table of the ``top`` functions by self time."""
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top]
+    lines = [f"{'calls':>9}{'self ms':>11}{'cum ms':>11}  function"]
+    for function, (_, calls, own, cumulative, _) in rows:
+        lines.append(
+            f"{calls:>9}{own * 1e3:>11.2f}{cumulative * 1e3:>11.2f}  {function_label(function)}"
+        )
+    return "\n".join(lines)
+
+
+@contextmanager
+def profiling(path: Union[str, Path], top: int = PROFILE_TOP) -> Iterator[cProfile.Profile]:
+    """Profile the enclosed block and export the result, even if the block fails.
+
+    Writes the pstats dump to ``path`` and the collapsed stacks next to it
+    (``path`` with ``.collapsed`` appended), then prints the ``top`` hot functions to stderr.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        stats = pstats.Stats(profile)
+        stats.dump_stats(str(path))
+        collapsed_path = Path(path).with_name(Path(path).name + ".collapsed")
+        write_collapsed(stats, collapsed_path)
+        # stderr, so that an archive streamed to stdout stays intact
+        print(
+            f"\n🔬 Profile ({stats.total_tt * 1e3:.0f} ms, top {top} by self time)\n"
+            + top_functions(stats, top),
+            file=sys.stderr,
+        )
+        print(
+            f"📈 Profile written to: {path} (pstats), {collapsed_path} (collapsed stacks)",
+            file=sys.stderr,
+        )
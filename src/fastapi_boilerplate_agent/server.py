@@ -0,0 +1,175 @@
+"""Long-lived HTTP generation service.
+
+Running the generator as a service pays Python startup, the LangChain imports
+and the graph compilation once instead of on every project. Concurrent
+identical requests are coalesced into a single pipeline execution, and every
+response reports where its time went through a ``Server-Timing`` header.
+
+Start it with ``fastapi-boilerplate serve`` (requires ``uvicorn``, available
+through the ``server`` extra).
+"""
+
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, Literal, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel, model_validator
+
+from .archive import archive_bytes
+from .cache import ConfigCache, normalize_request
+from .config import ProjectConfig
+from .tools import render_cache_info, render_project, to_snake_case
+
+ARCHIVE_MEDIA_TYPES = {"zip": "application/zip", "tar.gz": "application/gzip"}
+
+
+class GenerateRequest(BaseModel):
+    """Body of ``POST /generate``: either a natural language request or a config."""
+
+    user_request: Optional[str] = None
+    config: Optional[ProjectConfig] = None
+    format: Literal["json", "zip", "tar.gz"] = "json"
+
+    @model_validator(mode="after")
+    def check_source(self) -> "GenerateRequest":
+        if (self.user_request is None) == (self.config is None):
+            raise ValueError("Provide exactly one of 'user_request' or 'config'")
+        return self
+
+    def coalescing_key(self) -> str:
+        """Identify requests that produce the same project."""
+        if self.config is not None:
+            return "config:" + json.dumps(self.config.model_dump(), sort_keys=True)
+        return "request:" + normalize_request(self.user_request)
+
+
+class GenerateResponse(BaseModel):
+    config: dict
+    files: Dict[str, str]
+
+
+class RequestCoalescer:
+    """Share one in-flight execution between concurrent identical requests."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable]) -> Tuple[object, bool]:
+        """Await the execution for ``key``, starting it with ``factory`` if needed.
+
+        Returns:
+            ``(result, coalesced)`` where ``coalesced`` tells whether the
+            result came from an execution started by another request
+        """
+        future = self._inflight.get(key)
+        coalesced = future is not None
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A disconnecting client must not cancel the execution others wait on
+        return await asyncio.shield(future), coalesced
+
+
+def create_app(
+    cache: Optional[ConfigCache] = None, pipeline=None, structured_output: bool = False
+) -> FastAPI:
+    """Build the service application.
+
+    Args:
+        cache: Config cache used by the pipeline
+        pipeline: A compiled graph from ``graph.build_async_app`` to serve
+            (compiled once here when omitted)
+        structured_output: Extract configs with the model's native structured
+            output (ignored when ``pipeline`` is given)
+    """
+    if pipeline is None:
+        from .graph import build_async_app
+
+        pipeline = build_async_app(cache=cache, structured_output=structured_output)
+
+    app = FastAPI(
+        title="FastAPI Boilerplate Generator",
+        description="Generate FastAPI projects over HTTP",
+    )
+    coalescer = RequestCoalescer()
+
+    async def execute(request: GenerateRequest) -> dict:
+        if request.config is not None:
+            config = request.config.model_dump()
+            return {"config": config, "files": render_project(config)}
+        state = {"user_request": request.user_request, "config": None, "files": None}
+        return await pipeline.ainvoke(state)
+
+    @app.get("/health")
+    def health():
+        render_cache = render_cache_info()
+        return {
+            "status": "ok",
+            "inflight": coalescer.inflight,
+            "render_cache": {
+                "hits": render_cache.hits,
+                "misses": render_cache.misses,
+                "size": render_cache.currsize,
+                "maxsize": render_cache.maxsize,
+            },
+        }
+
+    @app.post("/generate", response_model=GenerateResponse)
+    async def generate(request: GenerateRequest, response: Response):
+        started = time.perf_counter()
+        try:
+            result, coalesced = await coalescer.run(
+                request.coalescing_key(), lambda: execute(request)
+            )
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Generation failed: {e}") from e
+        generated = time.perf_counter()
+
+        timings = [f"pipeline;dur={(generated - started) * 1000:.2f}"]
+        headers = {"X-Coalesced": "true" if coalesced else "false"}
+        config, files = result["config"], result["files"] or {}
+
+        if request.format == "json":
+            headers["Server-Timing"] = ", ".join(timings)
+            response.headers.update(headers)
+            return {"config": config, "files": files}
+
+        root = to_snake_case(config.get("project_name", "fastapi_app"))
+        body = archive_bytes(files, fmt=request.format, root=root)
+        timings.append(f"archive;dur={(time.perf_counter() - generated) * 1000:.2f}")
+        headers["Server-Timing"] = ", ".join(timings)
+        headers["Content-Disposition"] = f'attachment; filename="{root}.{request.format}"'
+        return Response(
+            content=body, media_type=ARCHIVE_MEDIA_TYPES[request.format], headers=headers
+        )
+
+    return app
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache: Optional[ConfigCache] = None,
+    structured_output: bool = False,
+) -> None:
+    """Run the service with uvicorn.
+
+    Raises:
+        SystemExit: If uvicorn is not installed
+    """
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit(
+            "The generation service needs uvicorn: "
+            "pip install 'fastapi-boilerplate-generator[server]'"
+        )
+    app = create_app(cache=cache, structured_output=structured_output)
+    uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,257 @@
+"""Precompiled templates rendered in a single pass, and the registry serving them.
+
+Templates are written in two styles: ``str.format`` templates with
+``{placeholder}`` fields, and "Ticket" templates that are specialised by
+chaining ``.replace("Ticket", ...).replace("ticket", ...)``. Both styles are
+parsed once into literal and placeholder segments so that each render is a
+single pass over the template instead of one scan per substitution.
+
+The template sources are package data files (``templates/*.tmpl``). A
+``TemplateRegistry`` reads and parses each one on first use, so importing the
+generator loads none of them and a run only pays for the templates it renders.
+Directories of replacement templates ("template packs") can be layered on top
+of the bundled ones.
+"""
+
+import os
+import threading
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from string import Formatter
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+Key = Union[str, int]
+
+# Suffix of template files, both bundled and in template packs
+TEMPLATE_SUFFIX = ".tmpl"
+
+
+class Template:
+    """A template parsed into alternating literal and placeholder segments.
+
+    ``literals`` always holds one more item than ``keys``: the rendered text
+    is ``literals[0] + value(keys[0]) + literals[1] + ...``.
+    """
+
+    __slots__ = ("literals", "keys", "_chain", "_compiled", "_getter")
+
+    def __init__(
+        self,
+        literals: Sequence[str],
+        keys: Sequence[Key],
+        chain: Sequence[Tuple[str, str]] = (),
+    ):
+        if len(literals) != len(keys) + 1:
+            raise ValueError("A template needs exactly one more literal than placeholders")
+        self.literals: Tuple[str, ...] = tuple(literals)
+        self.keys: Tuple[Key, ...] = tuple(keys)
+        self._chain: Tuple[Tuple[str, str], ...] = tuple(chain)
+        # Compile down to a positional %-style template so that rendering is a
+        # single pass done by the interpreter's C formatting code, fed by a
+        # C-level itemgetter instead of a Python loop over the placeholders.
+        self._compiled = "%s".join(literal.replace("%", "%%") for literal in self.literals)
+        if len(self.keys) == 1:
+            key = self.keys[0]
+            self._getter = lambda values: (values[key],)
+        elif self.keys:
+            self._getter = itemgetter(*self.keys)
+        else:
+            self._getter = lambda values: ()
+
+    @classmethod
+    def from_format(cls, source: str) -> "Template":
+        """Parse a ``str.format`` template (``{name}`` fields, ``{{``/``}}`` escapes).
+
+        Raises:
+            ValueError: If a field uses indexing, attributes, a format spec
+                or a conversion, which the single-pass renderer does not support.
+        """
+        literals = [""]
+        keys = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            literals[-1] += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            keys.append(field)
+            literals.append("")
+        return cls(literals, keys)
+
+    @classmethod
+    def from_replacements(cls, source: str, chain: Sequence[Tuple[str, str]]) -> "Template":
+        """Parse a template specialised by chained ``str.replace`` calls.
+
+        Args:
+            source: The raw template text.
+            chain: Ordered ``(token, name)`` pairs. Rendering with
+                ``name=value`` reproduces ``source.replace(token, value)``
+                applied in this order.
+        """
+        # Each link of the chain gets its own placeholder key (its position),
+        # since the same name may be used by several links.
+        literals = [source]
+        keys: list = []
+        for position, (token, _) in enumerate(chain):
+            new_literals: list = []
+            new_keys: list = []
+            for index, literal in enumerate(literals):
+                pieces = literal.split(token)
+                new_literals.extend(pieces)
+                new_keys.extend([position] * (len(pieces) - 1))
+                if index < len(keys):
+                    new_keys.append(keys[index])
+            literals, keys = new_literals, new_keys
+        return cls(literals, keys, chain)
+
+    def render(self, **values: str) -> str:
+        """Render the template with ``values`` in one pass."""
+        if self._chain:
+            return self._compiled % self._getter(
+                _resolve_chain(self._chain, tuple([values[name] for _, name in self._chain]))
+            )
+        return self._compiled % self._getter(values)
+
+
+@lru_cache(maxsize=256)
+def _resolve_chain(chain: Tuple[Tuple[str, str], ...], values: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Resolve replacement values the way a ``.replace`` chain would.
+
+    In ``text.replace(a, x).replace(b, y)`` the value ``x`` is itself scanned
+    for ``b``. Applying the later links of the chain to each value up front
+    keeps the single-pass output byte-identical. The result only depends on
+    the chain and the values, so it is shared by every template of a project.
+    """
+    resolved = []
+    for position, value in enumerate(values):
+        for (later_token, _), later_value in zip(chain[position + 1:], values[position + 1:]):
+            value = value.replace(later_token, later_value)
+        resolved.append(value)
+    return tuple(resolved)
+
+
+class TemplateRegistry:
+    """Templates loaded from package data on first use, with optional overrides.
+
+    Each template is identified by its path relative to the template root,
+    without the ``.tmpl`` suffix (``"app/main.py"``). The registry only knows
+    the templates declared in ``specs``, along with how each is compiled: a
+    compiler is called with the template source and returns what ``get``
+    hands out (``str`` for static files, ``Template.from_format``...).
+
+    Template packs are directories laid out like the bundled templates. A
+    pack only needs the files it overrides; later packs take precedence.
+    """
+
+    def __init__(
+        self,
+        package: str,
+        specs: Mapping[str, Callable[[str], object]],
+        env_var: Optional[str] = None,
+    ):
+        """
+        Args:
+            package: Package holding the bundled ``templates`` directory
+            specs: Template name -> compiler
+            env_var: Environment variable listing template pack directories
+                (separated by ``os.pathsep``), read on first use
+        """
+        self.package = package
+        self.specs = dict(specs)
+        self.env_var = env_var
+        # Bumped whenever the packs change, so that callers caching rendered
+        # output can tell their results apart
+        self.generation = 0
+        self._packs: Optional[Tuple[Path, ...]] = None
+        self._compiled: Dict[str, object] = {}
+        # Reentrant: compiling a template may read the packs from the environment
+        self._lock = threading.RLock()
+
+    @property
+    def packs(self) -> Tuple[Path, ...]:
+        """Template pack directories in use, lowest priority first."""
+        if self._packs is None:
+            paths = os.environ.get(self.env_var, "") if self.env_var else ""
+            packs = self._check_packs(path for path in paths.split(os.pathsep) if path)
+            with self._lock:
+                # The packs every template has been loaded from so far: the
+                # generation stays, so results cached under it remain valid
+                if self._packs is None:
+                    self._packs = packs
+        return self._packs
+
+    def set_packs(self, directories: Iterable[Union[str, Path]]) -> None:
+        """Replace the template packs layered on top of the bundled templates.
+
+        Raises:
+            ValueError: If a directory does not exist or holds a ``.tmpl``
+                file that does not override a known template (most likely a
+                typo in its path)
+        """
+        packs = self._check_packs(directories)
+        with self._lock:
+            self._packs = packs
+            self._compiled = {}
+            self.generation += 1
+
+    def _check_packs(self, directories: Iterable[Union[str, Path]]) -> Tuple[Path, ...]:
+        packs = []
+        for directory in directories:
+            path = Path(directory).expanduser()
+            if not path.is_dir():
+                raise ValueError(f"Template pack {str(path)!r} is not a directory")
+            for file in path.rglob("*" + TEMPLATE_SUFFIX):
+                name = file.relative_to(path).as_posix()[: -len(TEMPLATE_SUFFIX)]
+                if name not in self.specs:
+                    raise ValueError(
+                        f"Template pack {str(path)!r} overrides unknown template {name!r}"
+                    )
+            packs.append(path)
+        return tuple(packs)
+
+    def source(self, name: str) -> str:
+        """Read the source of template ``name``, from the last pack overriding it.
+
+        Raises:
+            KeyError: If ``name`` is not a known template
+        """
+        if name not in self.specs:
+            raise KeyError(f"Unknown template {name!r}")
+        filename = name + TEMPLATE_SUFFIX
+        for pack in reversed(self.packs):
+            path = pack / filename
+            if path.is_file():
+                return path.read_text(encoding="utf-8")
+        from importlib.resources import files
+
+        return files(self.package).joinpath("templates", filename).read_text(encoding="utf-8")
+
+    def get(self, name: str):
+        """Return template ``name`` compiled, loading it on first use.
+
+        Raises:
+            KeyError: If ``name`` is not a known template
+            ValueError: If the template (typically from a pack) does not
+                compile, or the packs named by ``env_var`` are invalid
+        """
+        try:
+            return self._compiled[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._compiled:
+                compiler = self.specs.get(name)
+                if compiler is None:
+                    raise KeyError(f"Unknown template {name!r}")
+                # Pack errors from source() already name the pack
+                source = self.source(name)
+                try:
+                    self._compiled[name] = compiler(source)
+                except ValueError as e:
+                    raise ValueError(f"Template {name!r}: {e}") from e
+            return self._compiled[name]
+
+    def loaded(self) -> Tuple[str, ...]:
+        """Names of the templates compiled so far."""
+        return tuple(self._compiled)
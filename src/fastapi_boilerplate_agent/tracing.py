@@ -0,0 +1,198 @@
+"""Lightweight timing and token instrumentation for generation runs.
+
+Code paths mark their phases with ``span("name")``. Spans are recorded only
+while a ``Tracer`` is active (see ``tracing``), so uninstrumented runs pay a
+single context variable lookup per span. The active tracer lives in a
+``ContextVar``, which follows the run into LangGraph nodes and asyncio tasks.
+
+A tracer prints a per-phase summary and exports its spans either as JSON
+Lines (one span per line) or in the Chrome trace event format, which can be
+opened in ``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+TRACE_FORMATS = ("chrome", "jsonl")
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar("active_tracer", default=None)
+
+
+@dataclass
+class Span:
+    """One timed phase of a run. Times are in microseconds since the tracer started."""
+
+    name: str
+    category: str
+    start_us: float
+    duration_us: float
+    thread_id: int
+    args: Dict[str, object] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collect spans and LLM token usage for one or more generation runs."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args) -> Iterator[Dict[str, object]]:
+        """Time the enclosed block.
+
+        Yields:
+            The span's ``args`` dict, so the block can attach results to it
+        """
+        started = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            finished = time.perf_counter_ns()
+            span = Span(
+                name=name,
+                category=category,
+                start_us=(started - self._origin_ns) / 1e3,
+                duration_us=(finished - started) / 1e3,
+                thread_id=threading.get_ident(),
+                args=args,
+            )
+            with self._lock:
+                self.spans.append(span)
+
+    def record_usage(self, message) -> Dict[str, int]:
+        """Add the token counts reported on an LLM response message.
+
+        Returns:
+            The prompt/completion counts of this message (zeros if not reported)
+        """
+        usage = getattr(message, "usage_metadata", None) or {}
+        counts = {
+            "prompt_tokens": int(usage.get("input_tokens", 0)),
+            "completion_tokens": int(usage.get("output_tokens", 0)),
+        }
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += counts["prompt_tokens"]
+            self.completion_tokens += counts["completion_tokens"]
+        return counts
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate spans by name: count and total/mean/max milliseconds."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(
+                span.name, {"category": span.category, "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_us / 1e3
+            entry["max_ms"] = max(entry["max_ms"], span.duration_us / 1e3)
+        for entry in totals.values():
+            entry["mean_ms"] = entry["total_ms"] / entry["count"]
+        return totals
+
+    def summary(self) -> str:
+        """Human readable table of time per node and phase, plus token usage."""
+        lines = [f"{'span':<28}{'count':>7}{'total ms':>12}{'mean ms':>12}{'max ms':>12}"]
+        for name, entry in sorted(self.totals().items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(
+                f"{name:<28}{entry['count']:>7}{entry['total_ms']:>12.2f}"
+                f"{entry['mean_ms']:>12.2f}{entry['max_ms']:>12.2f}"
+            )
+        lines.append(
+            f"LLM calls: {self.llm_calls}, prompt tokens: {self.prompt_tokens}, "
+            f"completion tokens: {self.completion_tokens}"
+        )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict:
+        """Return the spans as a Chrome trace event document."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_us,
+                "dur": span.duration_us,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            }
+            for span in self.spans
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "llm_calls": self.llm_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            },
+        }
+
+    def export(self, path: str, fmt: Optional[str] = None) -> None:
+        """Write the trace to ``path``.
+
+        Args:
+            path: Destination file
+            fmt: ``"chrome"`` or ``"jsonl"``; inferred from the suffix when
+                omitted (``.jsonl`` for JSON Lines, Chrome trace otherwise)
+
+        Raises:
+            ValueError: If ``fmt`` is not supported
+        """
+        fmt = fmt or ("jsonl" if path.endswith(".jsonl") else "chrome")
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unsupported trace format {fmt!r}; expected one of {TRACE_FORMATS}")
+        with open(path, "w", encoding="utf-8") as handle:
+            if fmt == "chrome":
+                json.dump(self.to_chrome_trace(), handle, default=str)
+                return
+            for span in self.spans:
+                handle.write(json.dumps(asdict(span), default=str) + "\n")
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the active tracer, if any."""
+    return _active_tracer.get()
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Activate ``tracer`` (a new one when omitted) for the enclosed block."""
+    tracer = tracer or Tracer()
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, category: str = "phase", **args) -> Iterator[Dict[str, object]]:
+    """Time the enclosed block on the active tracer; does nothing when tracing is off."""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, category, **args) as span_args:
+        yield span_args
+
+
+def record_usage(message) -> Dict[str, int]:
+    """Record LLM token usage on the active tracer, if any."""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return {}
+    return tracer.record_usage(message)
@@ -0,0 +1,203 @@
+"""Writing generated projects to disk.
+
+Files are consumed from a mapping or a stream of ``(path, content)`` pairs
+(see ``tools.iter_fastapi_boilerplate``) and handed to a small thread pool.
+Each directory is created once, and each file is written to a temporary file
+next to its target and renamed into place, so a reader never observes a
+half-written file. At most ``2 * workers`` files are buffered at any time.
+
+A manifest (path -> content hash) is stored in the project directory. When
+regenerating into the same directory, files whose content did not change are
+not rewritten, which keeps editor, Docker layer and ``__pycache__`` caches
+valid, and files the new configuration no longer produces can be pruned.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+DEFAULT_WRITE_WORKERS = 4
+MANIFEST_NAME = ".fastapi-boilerplate-manifest.json"
+MANIFEST_VERSION = 1
+
+Files = Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write ``content`` to ``path`` through a temporary file and a rename."""
+    tmp_path = _tmp_path(path)
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Binary counterpart of ``atomic_write_text``."""
+    tmp_path = _tmp_path(path)
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@dataclass
+class WriteReport:
+    """What ``write_project`` did to the project directory."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Produced by a previous run but not by this one
+    removed: List[str] = field(default_factory=list)
+    # Subset of ``removed`` that was deleted from disk
+    pruned: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """Number of files in the generated project."""
+        return len(self.added) + len(self.changed) + len(self.unchanged)
+
+    def summary(self) -> str:
+        parts = [
+            f"{len(self.added)} added",
+            f"{len(self.changed)} changed",
+            f"{len(self.unchanged)} unchanged",
+        ]
+        if self.pruned:
+            parts.append(f"{len(self.pruned)} pruned")
+        kept = len(self.removed) - len(self.pruned)
+        if kept:
+            parts.append(f"{kept} no longer generated (kept)")
+        return ", ".join(parts)
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_manifest(out_dir: Path) -> Dict[str, str]:
+    """Return the path -> hash manifest of a previous run (empty if none/unreadable)."""
+    try:
+        data = json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_manifest(out_dir: Path, hashes: Dict[str, str]) -> None:
+    payload = {"version": MANIFEST_VERSION, "files": dict(sorted(hashes.items()))}
+    atomic_write_text(out_dir / MANIFEST_NAME, json.dumps(payload, indent=2) + "\n")
+
+
+def _prune(out_dir: Path, paths: List[str], previous: Dict[str, str]) -> List[str]:
+    """Delete files from a previous run, unless they were edited since.
+
+    Returns:
+        The paths that were deleted (or were already gone)
+    """
+    deleted = []
+    for path in paths:
+        file_path = out_dir / path
+        try:
+            if content_hash(file_path.read_text(encoding="utf-8")) != previous[path]:
+                continue  # modified by hand: leave it alone
+            file_path.unlink()
+        except FileNotFoundError:
+            deleted.append(path)
+            continue
+        except (OSError, UnicodeDecodeError):
+            continue
+        deleted.append(path)
+        # Remove directories left empty, up to the project root
+        parent = file_path.parent
+        while parent != out_dir:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+    return deleted
+
+
+def write_project(
+    files: Files,
+    out_dir: Path,
+    workers: int = DEFAULT_WRITE_WORKERS,
+    prune: bool = False,
+) -> WriteReport:
+    """Write a generated project under ``out_dir``, skipping unchanged files.
+
+    A file is left untouched when it exists and its hash matches the one
+    recorded by the previous run.
+
+    Args:
+        files: Mapping of file path -> content, or an iterable of such pairs
+        out_dir: Project directory (created if missing)
+        workers: Number of writer threads
+        prune: Delete files the previous run produced but this one does not
+            (files edited since the previous run are kept)
+
+    Returns:
+        A report of added, changed, unchanged and removed files
+    """
+    if isinstance(files, Mapping):
+        files = files.items()
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(out_dir)
+    hashes: Dict[str, str] = {}
+    report = WriteReport()
+    created_dirs = {out_dir}
+    max_pending = 2 * workers
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="writer") as pool:
+        for path, content in files:
+            file_path = out_dir / path
+            digest = hashes[path] = content_hash(content)
+            if path not in previous:
+                report.added.append(path)
+            elif previous[path] != digest:
+                report.changed.append(path)
+            elif file_path.exists():
+                report.unchanged.append(path)
+                continue
+            else:
+                report.added.append(path)  # deleted since the previous run
+            if file_path.parent not in created_dirs:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(file_path.parent)
+
+            # Bound the number of rendered files held in memory
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(pool.submit(atomic_write_text, file_path, content))
+
+        for future in wait(pending).done:
+            future.result()
+
+    report.removed = sorted(set(previous) - set(hashes))
+    if prune and report.removed:
+        report.pruned = _prune(out_dir, report.removed, previous)
+    # Keep tracking stale files still on disk so that a later run can prune them
+    hashes.update((path, previous[path]) for path in report.removed if path not in report.pruned)
+    _write_manifest(out_dir, hashes)
+    return report
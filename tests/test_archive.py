@@ -0,0 +1,39 @@
+"""Tests for reproducible project archives."""
+
+import hashlib
+import subprocess
+import sys
+
+import pytest
+
+from fastapi_boilerplate_agent.archive import archive_bytes, write_archive
+from fastapi_boilerplate_agent.tools import render_project
+
+CONFIG = {"project_name": "shop", "db": "sqlite"}
+
+# Archives the same project in a fresh interpreter and prints its hash
+SCRIPT = """
+import hashlib, sys
+from fastapi_boilerplate_agent.archive import archive_bytes
+from fastapi_boilerplate_agent.tools import render_project
+data = archive_bytes(render_project({config!r}), fmt=sys.argv[1], root="shop")
+print(hashlib.sha256(data).hexdigest())
+"""
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar.gz"])
+def test_archives_are_byte_identical_across_runs(fmt, tmp_path):
+    data = archive_bytes(render_project(CONFIG), fmt=fmt, root="shop")
+    other_run = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(config=CONFIG), fmt],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    assert hashlib.sha256(data).hexdigest() == other_run
+
+    # A seekable file holds the same bytes as the streamed buffer
+    path = tmp_path / f"shop.{fmt}"
+    with open(path, "wb") as handle:
+        write_archive(render_project(CONFIG), handle, fmt=fmt, root="shop")
+    assert path.read_bytes() == data
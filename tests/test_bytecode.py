@@ -0,0 +1,68 @@
+"""Tests for the compile check and bytecode precompilation."""
+
+import importlib.util
+import marshal
+
+import pytest
+
+from fastapi_boilerplate_agent import bytecode, tools
+from fastapi_boilerplate_agent.bytecode import check_project, write_bytecode
+from fastapi_boilerplate_agent.cli import main
+from fastapi_boilerplate_agent.templating import TemplateRegistry
+
+BROKEN = {"app/__init__.py": "", "app/broken.py": "x = 1\ndef f(:\n    pass\n"}
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_check_reports_file_and_line(monkeypatch, parallel):
+    if parallel:
+        monkeypatch.setattr(bytecode, "PARALLEL_MIN_FILES", 1)
+    with pytest.raises(SyntaxError) as excinfo:
+        check_project(BROKEN, workers=2 if parallel else 1)
+    assert (excinfo.value.filename, excinfo.value.lineno) == ("app/broken.py", 2)
+
+
+@pytest.fixture
+def broken_pack(monkeypatch, tmp_path):
+    """Serve a pack whose pagination template renders invalid Python."""
+    pack = tmp_path / "pack"
+    (pack / "app/core").mkdir(parents=True)
+    (pack / "app/core/pagination.py.tmpl").write_text('"""Pagination."""\n\ndef broken(:\n')
+    monkeypatch.setenv(tools.TEMPLATES_ENV_VAR, str(pack))
+    monkeypatch.setattr(
+        tools,
+        "templates",
+        TemplateRegistry(
+            "fastapi_boilerplate_agent", tools._TEMPLATE_SPECS, env_var=tools.TEMPLATES_ENV_VAR
+        ),
+    )
+    tools.clear_render_cache()
+    yield
+    tools.clear_render_cache()  # do not serve the broken renders to later tests
+
+
+@pytest.mark.usefixtures("broken_pack")
+def test_cli_reports_generated_file_and_line(tmp_path, capsys):
+    config = tmp_path / "project.json"
+    config.write_text('{"project_name": "shop", "db": "sqlite"}')
+
+    assert main(["--config", str(config), "--out-root", str(tmp_path / "out")]) == 1
+    assert "does not compile: app/core/pagination.py:3:" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
+
+
+def test_precompiled_bytecode_is_checked_hash(tmp_path):
+    source = "VALUE = 42\n"
+    pycs = check_project({"app/values.py": source, "README.md": "# no pyc\n"}, bytecode=True)
+    assert list(pycs) == ["app/values.py"]
+    assert write_bytecode(tmp_path, pycs) == 1
+
+    pyc_path = importlib.util.cache_from_source(str(tmp_path / "app/values.py"))
+    with open(pyc_path, "rb") as handle:
+        data = handle.read()
+    assert data[:4] == importlib.util.MAGIC_NUMBER
+    assert int.from_bytes(data[4:8], "little") == bytecode.CHECKED_HASH_FLAGS
+    assert data[8:16] == importlib.util.source_hash(source.encode("utf-8"))
+    namespace = {}
+    exec(marshal.loads(data[16:]), namespace)
+    assert namespace["VALUE"] == 42
@@ -0,0 +1,78 @@
+"""Tests for the on-disk config extraction cache."""
+
+import os
+
+import pytest
+
+from fastapi_boilerplate_agent import graph
+from fastapi_boilerplate_agent.cache import ConfigCache
+from fastapi_boilerplate_agent.config import ProjectConfig
+
+CONFIG = ProjectConfig(project_name="shop", db="sqlite", ci="none")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConfigCache(tmp_path / "cache")
+
+
+def test_key_ignores_whitespace():
+    assert ConfigCache.make_key("A  shop\nAPI ", "m", "1") == ConfigCache.make_key(
+        "A shop API", "m", "1"
+    )
+
+
+@pytest.mark.parametrize(
+    "request_text, model_name, prompt_version",
+    [("A blog API", "m", "1"), ("A shop API", "other", "1"), ("A shop API", "m", "2")],
+)
+def test_key_changes_with_request_model_and_prompt(request_text, model_name, prompt_version):
+    key = ConfigCache.make_key("A shop API", "m", "1")
+    assert ConfigCache.make_key(request_text, model_name, prompt_version) != key
+
+
+def test_round_trip(cache):
+    key = cache.make_key("A shop API", "m", "1")
+    assert cache.get(key) is None
+    cache.put(key, CONFIG)
+    assert cache.get(key) == CONFIG
+
+
+@pytest.mark.parametrize("content", ["{not json", '{"db": "mysql"}', "[]"])
+def test_corrupt_entry_is_a_miss_and_removed(cache, content):
+    key = cache.make_key("A shop API", "m", "1")
+    cache.put(key, CONFIG)
+    path = cache.cache_dir / f"{key}.json"
+    path.write_text(content)
+    assert cache.get(key) is None
+    assert not path.exists()
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = ConfigCache(tmp_path, max_age_seconds=60)
+    cache.put("old", CONFIG)
+    path = tmp_path / "old.json"
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime - 61))
+    assert cache.get("old") is None
+    assert not path.exists()
+
+
+def test_evicts_oldest_entries_over_max_bytes(tmp_path):
+    cache = ConfigCache(tmp_path)
+    for age, key in ((30, "c"), (20, "b"), (10, "a")):
+        cache.put(key, CONFIG)
+        path = tmp_path / f"{key}.json"
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime - age))
+    cache.max_bytes = 2 * (tmp_path / "a.json").stat().st_size
+    cache.put("d", CONFIG)
+    assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["a", "d"]
+
+
+def test_hit_skips_the_model(cache, monkeypatch):
+    def no_model(structured_output):
+        raise AssertionError("the model was called on a cache hit")
+
+    request = "A shop API"
+    cache.put(cache.make_key(request, graph.MODEL_NAME, graph.PROMPT_VERSION), CONFIG)
+    monkeypatch.setattr(graph, "_extraction_model", no_model)
+    assert graph.to_config_dict(request, cache=cache) == CONFIG.model_dump()
@@ -0,0 +1,56 @@
+"""Tests for the command-line entry points that run without the LLM."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi_boilerplate_agent.cli import assign_out_dirs, main
+
+
+def test_assign_out_dirs_suffixes_clashing_names(tmp_path):
+    out_dirs = assign_out_dirs({3: "Alpha", 1: "alpha", 2: "beta", 4: "alpha"}, tmp_path)
+    assert {index: path.name for index, path in out_dirs.items()} == {
+        1: "alpha",
+        2: "beta",
+        3: "alpha_2",
+        4: "alpha_3",
+    }
+
+
+def test_batch_with_malformed_line(tmp_path, capsys):
+    batch = tmp_path / "b.jsonl"
+    batch.write_text('{"user_request": "A ticket API"}\n{"foo": 1}\n')
+    assert main(["--batch", str(batch), "--out-root", str(tmp_path / "out")]) == 1
+    assert "b.jsonl:2: missing 'user_request'" in capsys.readouterr().err
+    assert not Path(tmp_path / "out").exists()
+
+
+def test_batch_with_missing_file(tmp_path, capsys):
+    assert main(["--batch", str(tmp_path / "missing.jsonl")]) == 1
+    assert "missing.jsonl" in capsys.readouterr().err
+
+
+def test_module_exit_code(tmp_path):
+    command = [sys.executable, "-m", "fastapi_boilerplate_agent.cli"]
+    result = subprocess.run(command + ["--batch", str(tmp_path / "no.jsonl")], capture_output=True)
+    assert result.returncode == 1
+
+
+def test_config_missing_file(tmp_path, capsys):
+    assert main(["--config", str(tmp_path / "nope.json"), "--out-root", str(tmp_path)]) == 1
+    assert "Cannot read" in capsys.readouterr().err
+
+
+def test_config_invalid(tmp_path, capsys):
+    config = tmp_path / "project.json"
+    config.write_text('{"project_name": "shop", "db": "mysql"}')
+    assert main(["--config", str(config), "--out-root", str(tmp_path / "out")]) == 1
+    assert "not a valid project config" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
+
+
+def test_config_generates_project(tmp_path):
+    config = tmp_path / "project.json"
+    config.write_text('{"project_name": "shop", "db": "sqlite"}')
+    assert main(["--config", str(config), "--out-root", str(tmp_path)]) == 0
+    assert (tmp_path / "shop" / "app" / "main.py").is_file()
@@ -0,0 +1,41 @@
+"""Tests for multi-entity projects."""
+
+import pytest
+from pydantic import ValidationError
+
+from fastapi_boilerplate_agent.config import ProjectConfig
+from fastapi_boilerplate_agent.tools import entity_names, render_project
+
+
+def test_entity_names():
+    assert entity_names(["Order", " line item "]) == [
+        {"class_name": "Order", "module_name": "order"},
+        {"class_name": "LineItem", "module_name": "line_item"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "entities, message",
+    [
+        (["order", "Order"], "Several entities map to the module 'order'"),
+        (["class"], "does not map to a valid module name"),
+        (["core"], "does not map to a valid module name"),
+        (["2fa"], "does not map to a valid module name"),
+    ],
+)
+def test_invalid_entities(entities, message):
+    with pytest.raises(ValueError, match=message):
+        entity_names(entities)
+    with pytest.raises(ValidationError, match=message):
+        ProjectConfig(project_name="shop", entities=entities)
+
+
+def test_one_module_per_entity():
+    files = render_project({"project_name": "shop", "entities": ["order", "line item"]})
+    for module_name, class_name in (("order", "Order"), ("line_item", "LineItem")):
+        for part in ("models", "schemas", "repositories", "services", "router"):
+            assert f"app/{module_name}/{part}.py" in files
+        assert f"class {class_name}(" in files[f"app/{module_name}/models.py"]
+        assert f"from app.{module_name}.router import" in files["app/main.py"]
+        assert f"tests/test_{module_name}_api.py" in files
+    assert not any(path.startswith("app/shop/") for path in files)
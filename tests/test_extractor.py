@@ -0,0 +1,136 @@
+"""Tests for the rule-based config extractor and the local repair of LLM replies."""
+
+import pytest
+
+from fastapi_boilerplate_agent.config import ProjectConfig
+from fastapi_boilerplate_agent.extractor import MIN_CONFIDENCE, extract_config, repair_config
+
+STACK = "with SQLite and GitHub Actions."
+
+
+@pytest.mark.parametrize(
+    "request_text",
+    [
+        f"Generate a FastAPI backend called 'shop' {STACK} Do not use Docker.",
+        f"Generate a FastAPI backend called 'shop' {STACK} Don't use Docker.",
+        f"Generate a FastAPI backend called 'shop' {STACK} Never use Docker.",
+        f"Generate a FastAPI backend called 'shop' {STACK} Not Docker.",
+        "Generate a FastAPI backend called 'shop' with SQLite, no Docker and GitHub Actions.",
+        f"Generate a FastAPI backend called 'shop' without Docker, {STACK}",
+        f"Generate a FastAPI backend called 'shop' {STACK} Docker is not needed.",
+        f"Generate a FastAPI backend called 'shop' {STACK} Docker isn't required.",
+    ],
+)
+def test_declined_docker(request_text):
+    config, confidence = extract_config(request_text)
+    assert confidence == 1.0
+    assert config["docker"] is False
+
+
+def test_requested_docker():
+    config, _ = extract_config(
+        "Generate a FastAPI backend called 'shop' with SQLite, Docker and GitHub Actions."
+    )
+    assert config["docker"] is True
+
+
+def test_unmentioned_options_keep_defaults():
+    config, confidence = extract_config(f"Generate a FastAPI backend called 'shop' {STACK}")
+    assert confidence == 1.0
+    defaults = ProjectConfig(project_name="shop", db="sqlite").model_dump()
+    assert config == defaults
+
+
+@pytest.mark.parametrize(
+    "request_text, name",
+    [
+        (f"Generate a FastAPI backend called 'bob's app' {STACK}", "bob's app"),
+        (f'Generate a FastAPI backend called "Shop API" {STACK}', "Shop API"),
+        (f"Generate a FastAPI backend named `inventory` {STACK}", "inventory"),
+        (f"Generate a FastAPI backend called shop {STACK}", "shop"),
+    ],
+)
+def test_project_name(request_text, name):
+    config, _ = extract_config(request_text)
+    assert config["project_name"] == name
+
+
+def test_declined_auth():
+    config, confidence = extract_config(
+        "Generate a FastAPI backend called 'shop' with PostgreSQL and GitHub Actions. "
+        "auth is not needed"
+    )
+    assert confidence == 1.0
+    assert config["auth_enabled"] is False
+    assert config["docker"] is True
+
+
+def test_declined_service_cache():
+    config, _ = extract_config(
+        f"Generate a FastAPI backend called 'shop' {STACK} Don't add a service cache."
+    )
+    assert config["service_cache"] is False
+
+
+def test_incomplete_request_goes_to_llm():
+    config, confidence = extract_config("Generate a FastAPI backend called 'shop' with SQLite.")
+    assert config is None
+    assert confidence < 1.0
+
+
+@pytest.mark.parametrize(
+    "request_text",
+    [
+        # A technology, not the project name
+        "Generate a backend for Postgres with GitHub Actions",
+        # Docker and CI are declined, yet GitHub is mentioned
+        "Generate a FastAPI backend called 'shop' with SQLite, without Docker or CI. "
+        "Put it on GitHub.",
+        # Negations the rules cannot attribute to one option
+        f"Generate a FastAPI backend called 'shop' {STACK} Docker and auth are not needed.",
+        f"Generate a FastAPI backend called 'shop' {STACK} Docker, maybe not.",
+        f"Generate a FastAPI backend called 'shop' with Docker {STACK} Do not use Docker.",
+    ],
+)
+def test_unclear_requests_go_to_llm(request_text):
+    config, confidence = extract_config(request_text)
+    assert config is None
+    assert confidence < MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        ('```json\n{"project_name": "shop", "db": "sqlite"}\n```', {"db": "sqlite"}),
+        ('Here you go: {"project_name": "shop"} Enjoy!', {}),
+        ({"Name": "shop", "Database": "PostgreSQL", "CI/CD": "GitHub Actions"}, {}),
+        (
+            {"project": "shop", "ci": "GitLab CI", "async": "yes"},
+            {"ci": "gitlab", "async_db": True},
+        ),
+        ({"project_name": "shop", "ci": None, "docker": "no"}, {"ci": "none", "docker": False}),
+        (
+            {"project_name": "shop", "auth": "off", "cache": "Enabled"},
+            {"auth_enabled": False, "service_cache": True},
+        ),
+    ],
+)
+def test_repair_config(reply, expected):
+    config = repair_config(reply)
+    assert config == ProjectConfig(project_name="shop", **expected)
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        "I cannot help with that.",
+        '{"project_name": "shop", ',
+        '["shop", "sqlite"]',
+        {"db": "sqlite"},
+        {"project_name": "shop", "db": "mysql"},
+        {"project_name": "shop", "docker": "maybe"},
+        None,
+    ],
+)
+def test_repair_config_gives_up(reply):
+    assert repair_config(reply) is None
@@ -0,0 +1,126 @@
+"""Tests for the LLM extraction path, run offline against a fake chat model."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage
+
+from fastapi_boilerplate_agent import graph
+from fastapi_boilerplate_agent.cache import ConfigCache
+from fastapi_boilerplate_agent.config import ProjectConfig
+
+
+class FakeModel:
+    """Stands in for the chat model: ``reply(text)`` answers the last message.
+
+    In structured mode the reply is sent as tool call arguments and wrapped
+    like ``with_structured_output(..., include_raw=True)`` does.
+    """
+
+    def __init__(self, reply, structured_output: bool = False, delay=lambda text: 0.0):
+        self.reply = reply
+        self.structured_output = structured_output
+        self.delay = delay
+        self.received = []
+
+    def _result(self, messages):
+        text = messages[-1].content
+        self.received.append(text)
+        reply = self.reply(text)
+        if not self.structured_output:
+            return AIMessage(content=reply)
+        tool_call = {"name": "ProjectConfig", "args": reply, "id": "call_1"}
+        raw = AIMessage(content="", tool_calls=[tool_call])
+        try:
+            return {"raw": raw, "parsed": ProjectConfig(**reply), "parsing_error": None}
+        except ValueError as error:
+            return {"raw": raw, "parsed": None, "parsing_error": error}
+
+    def invoke(self, messages):
+        return self._result(messages)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.delay(messages[-1].content))
+        return self._result(messages)
+
+
+def use_model(monkeypatch, model):
+    monkeypatch.setattr(graph, "_extraction_model", lambda structured_output: model)
+
+
+def test_abatch_keeps_order_and_returns_failures(monkeypatch):
+    def reply(text):
+        if "broken" in text or "Validation error" in text:
+            return "I cannot help with that."
+        return json.dumps({"project_name": text.split()[0], "db": "sqlite"})
+
+    # Later requests answer first
+    use_model(monkeypatch, FakeModel(reply, delay=lambda text: 0.03 if "alpha" in text else 0.0))
+    requests = ["alpha API", "broken API", "gamma API"]
+    results = asyncio.run(graph.agenerate_batch(requests, max_concurrency=3))
+
+    assert [result["config"]["project_name"] for result in (results[0], results[2])] == [
+        "alpha",
+        "gamma",
+    ]
+    assert "app/main.py" in results[0]["files"]
+    assert isinstance(results[1], OutputParserException)
+
+
+def test_async_extraction_uses_the_cache(monkeypatch, tmp_path):
+    model = FakeModel(lambda text: json.dumps({"project_name": "shop"}))
+    use_model(monkeypatch, model)
+    cache = ConfigCache(tmp_path)
+
+    first = asyncio.run(graph.ato_config_dict("A shop API", cache=cache))
+    second = asyncio.run(graph.ato_config_dict("A shop API", cache=cache))
+    assert first == second == ProjectConfig(project_name="shop").model_dump()
+    assert len(model.received) == 1
+
+
+# First replies that fail validation and that the local repair cannot fix
+UNSALVAGEABLE = {False: "Sure! The project is a shop API.", True: {"db": "sqlite"}}
+VALID = {
+    False: '{"project_name": "shop", "db": "sqlite"}',
+    True: {"project_name": "shop", "db": "sqlite"},
+}
+
+
+@pytest.mark.parametrize("structured_output", [False, True])
+def test_one_repair_round_trip(monkeypatch, structured_output):
+    replies = iter([UNSALVAGEABLE[structured_output], VALID[structured_output]])
+    model = FakeModel(lambda text: next(replies), structured_output=structured_output)
+    use_model(monkeypatch, model)
+
+    config = graph.to_config_dict("A shop API", structured_output=structured_output)
+    assert config == ProjectConfig(project_name="shop", db="sqlite").model_dump()
+    request, repair = model.received
+    assert request == "A shop API"
+    assert "Validation error" in repair
+
+
+@pytest.mark.parametrize("structured_output", [False, True])
+def test_local_repair_skips_the_round_trip(monkeypatch, structured_output):
+    reply = {"Name": "shop", "database": "SQLite", "docker": "no"}
+    if not structured_output:
+        reply = f"```json\n{json.dumps(reply)}\n```"
+    model = FakeModel(lambda text: reply, structured_output=structured_output)
+    use_model(monkeypatch, model)
+
+    config = graph.to_config_dict("A shop API", structured_output=structured_output)
+    assert config == ProjectConfig(project_name="shop", db="sqlite", docker=False).model_dump()
+    assert len(model.received) == 1
+
+
+@pytest.mark.parametrize("structured_output", [False, True])
+def test_failed_repair_raises(monkeypatch, structured_output):
+    model = FakeModel(lambda text: UNSALVAGEABLE[structured_output], structured_output)
+    use_model(monkeypatch, model)
+
+    with pytest.raises(OutputParserException, match="after a repair attempt"):
+        graph.to_config_dict("A shop API", structured_output=structured_output)
+    with pytest.raises(OutputParserException, match="after a repair attempt"):
+        asyncio.run(graph.ato_config_dict("A shop API", structured_output=structured_output))
+    assert len(model.received) == 4
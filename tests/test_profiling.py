@@ -0,0 +1,63 @@
+"""Tests for the profile export and the collapsed stack reconstruction."""
+
+import pstats
+
+from fastapi_boilerplate_agent.profiling import collapsed_stacks, function_label, profiling
+
+MAIN = ("/src/app/cli.py", 1, "main")
+RENDER = ("/src/app/tools.py", 10, "render")
+WRITE = ("/src/app/writer.py", 20, "write")
+HASH = ("~", 0, "<built-in method _hashlib.openssl_sha256>")
+
+
+def make_stats(functions) -> pstats.Stats:
+    """Stats of a synthetic call graph: function -> (self s, cumulative s, {caller: cum s})."""
+    stats = pstats.Stats()
+    for function, (own, cumulative, callers) in functions.items():
+        edges = {caller: (1, 1, 0.0, edge) for caller, edge in callers.items()}
+        stats.stats[function] = (1, 1, own, cumulative, edges)
+    stats.total_tt = sum(own for own, _, _ in functions.values())
+    return stats
+
+
+def test_function_label():
+    assert function_label(RENDER) == "app/tools.py:render:10"
+    assert function_label(HASH) == "<built-in method _hashlib.openssl_sha256>"
+
+
+def test_collapsed_stacks_split_shared_callees():
+    # main calls render and write; both hash, render for 1 s and write for 3 s
+    stats = make_stats({
+        MAIN: (1.0, 10.0, {}),
+        RENDER: (2.0, 3.0, {MAIN: 3.0}),
+        WRITE: (2.0, 5.0, {MAIN: 5.0}),
+        HASH: (4.0, 4.0, {RENDER: 1.0, WRITE: 3.0}),
+    })
+    main, render, write = (function_label(f) for f in (MAIN, RENDER, WRITE))
+    hashing = function_label(HASH)
+    assert collapsed_stacks(stats) == {
+        main: 1_000_000,
+        f"{main};{render}": 2_000_000,
+        f"{main};{render};{hashing}": 1_000_000,
+        f"{main};{write}": 2_000_000,
+        f"{main};{write};{hashing}": 3_000_000,
+    }
+
+
+def test_collapsed_stacks_fold_recursion():
+    # render calls itself: its time stays on the outermost frame
+    stats = make_stats({
+        MAIN: (1.0, 4.0, {}),
+        RENDER: (3.0, 3.0, {MAIN: 3.0, RENDER: 2.0}),
+    })
+    main, render = function_label(MAIN), function_label(RENDER)
+    assert collapsed_stacks(stats) == {main: 1_000_000, f"{main};{render}": 3_000_000}
+
+
+def test_profiling_writes_both_files(tmp_path, capsys):
+    path = tmp_path / "run.prof"
+    with profiling(path, top=3):
+        sorted(range(1000), key=lambda value: -value)
+    assert pstats.Stats(str(path)).total_calls > 0
+    assert (tmp_path / "run.prof.collapsed").read_text().strip()
+    assert "run.prof.collapsed (collapsed stacks)" in capsys.readouterr().err
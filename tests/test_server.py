@@ -0,0 +1,121 @@
+"""Tests for the HTTP generation service, run offline against a stub pipeline."""
+
+import asyncio
+import io
+import tarfile
+import zipfile
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi_boilerplate_agent.server import create_app
+from fastapi_boilerplate_agent.tools import render_project
+
+CONFIG = {"project_name": "Stub API", "db": "sqlite", "docker": False, "ci": "github"}
+
+
+class StubPipeline:
+    """Stands in for the compiled graph: returns a fixed config, no LLM."""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def ainvoke(self, state):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"config": CONFIG, "files": render_project(CONFIG)}
+
+
+@pytest.fixture
+def pipeline():
+    return StubPipeline()
+
+
+@pytest.fixture
+def client(pipeline):
+    return TestClient(create_app(pipeline=pipeline))
+
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["inflight"] == 0
+    assert set(data["render_cache"]) == {"hits", "misses", "size", "maxsize"}
+
+
+def test_generate_json(client, pipeline):
+    response = client.post("/generate", json={"user_request": "A ticket API"})
+    assert response.status_code == 200
+    assert response.headers["X-Coalesced"] == "false"
+    assert response.headers["Server-Timing"].startswith("pipeline;dur=")
+    data = response.json()
+    assert data["config"] == CONFIG
+    assert "app/main.py" in data["files"]
+    assert pipeline.calls == 1
+
+
+def test_generate_from_config_skips_pipeline(client, pipeline):
+    response = client.post("/generate", json={"config": CONFIG})
+    assert response.status_code == 200
+    assert "app/main.py" in response.json()["files"]
+    assert pipeline.calls == 0
+
+
+def test_generate_requires_one_source(client):
+    assert client.post("/generate", json={}).status_code == 422
+    body = {"user_request": "A ticket API", "config": CONFIG}
+    assert client.post("/generate", json=body).status_code == 422
+
+
+def test_generate_zip(client):
+    response = client.post("/generate", json={"user_request": "A ticket API", "format": "zip"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert 'filename="stub_api.zip"' in response.headers["Content-Disposition"]
+    assert "archive;dur=" in response.headers["Server-Timing"]
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert "stub_api/app/main.py" in archive.namelist()
+
+
+def test_generate_tar(client):
+    body = {"user_request": "A ticket API", "format": "tar.gz"}
+    response = client.post("/generate", json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="stub_api.tar.gz"' in response.headers["Content-Disposition"]
+    with tarfile.open(fileobj=io.BytesIO(response.content), mode="r:gz") as archive:
+        assert "stub_api/app/main.py" in archive.getnames()
+
+
+def test_generate_pipeline_failure():
+    client = TestClient(create_app(pipeline=StubPipeline(error=RuntimeError("model down"))))
+    response = client.post("/generate", json={"user_request": "A ticket API"})
+    assert response.status_code == 502
+    assert "model down" in response.json()["detail"]
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    pipeline = StubPipeline(delay=0.2)
+    app = create_app(pipeline=pipeline)
+
+    async def generate_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Whitespace differences normalize to the same request
+            return await asyncio.gather(
+                client.post("/generate", json={"user_request": "A ticket API"}),
+                client.post("/generate", json={"user_request": "  A ticket\n API "}),
+            )
+
+    responses = asyncio.run(generate_twice())
+    assert [r.status_code for r in responses] == [200, 200]
+    assert sorted(r.headers["X-Coalesced"] for r in responses) == ["false", "true"]
+    assert responses[0].json() == responses[1].json()
+    assert pipeline.calls == 1
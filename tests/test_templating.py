@@ -0,0 +1,77 @@
+"""Tests for the template registry and the render memo built on it."""
+
+import pytest
+
+from fastapi_boilerplate_agent import tools
+from fastapi_boilerplate_agent.cli import main
+from fastapi_boilerplate_agent.templating import TemplateRegistry
+
+
+def fresh_registry() -> TemplateRegistry:
+    return TemplateRegistry(
+        "fastapi_boilerplate_agent", tools._TEMPLATE_SPECS, env_var=tools.TEMPLATES_ENV_VAR
+    )
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.delenv(tools.TEMPLATES_ENV_VAR, raising=False)
+    return fresh_registry()
+
+
+def test_first_pack_load_keeps_generation(registry):
+    registry.get("app/main.py")
+    assert registry.packs == ()
+    assert registry.generation == 0
+
+
+def test_set_packs_bumps_generation(registry, tmp_path):
+    (tmp_path / "Makefile.tmpl").write_text("custom\n")
+    registry.set_packs([tmp_path])
+    assert registry.generation == 1
+    assert registry.get("Makefile") == "custom\n"
+
+
+def test_set_packs_rejects_unknown_templates(registry, tmp_path):
+    (tmp_path / "Makefil.tmpl").write_text("typo\n")
+    with pytest.raises(ValueError, match="unknown template"):
+        registry.set_packs([tmp_path])
+
+
+def test_render_project_hits_after_first_render(monkeypatch):
+    monkeypatch.delenv(tools.TEMPLATES_ENV_VAR, raising=False)
+    monkeypatch.setattr(tools, "templates", fresh_registry())
+    tools.clear_render_cache()
+    config = {"project_name": "Memo API"}
+    first = tools.render_project(config)
+    assert tools.render_project(config) is first
+    assert tools.render_project(config) is first
+    info = tools.render_cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+@pytest.mark.parametrize("async_db", [False, True])
+def test_threadpool_sized_on_sync_postgres_only(async_db):
+    files = tools.render_project({"project_name": "shop", "async_db": async_db})
+    assert tools.POOL_ROUTER_INCLUDE in files["app/main.py"]
+    assert (tools.THREADPOOL_ROUTER_INCLUDE in files["app/main.py"]) is not async_db
+
+
+def test_invalid_env_pack_names_the_pack(monkeypatch, tmp_path):
+    monkeypatch.setenv(tools.TEMPLATES_ENV_VAR, str(tmp_path / "nonexist"))
+    with pytest.raises(ValueError) as excinfo:
+        fresh_registry().get("app/main.py")
+    assert str(excinfo.value) == f"Template pack {str(tmp_path / 'nonexist')!r} is not a directory"
+
+
+def test_cli_reports_invalid_env_pack(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv(tools.TEMPLATES_ENV_VAR, str(tmp_path / "nonexist"))
+    monkeypatch.setattr(tools, "templates", fresh_registry())
+    config = tmp_path / "project.json"
+    config.write_text('{"project_name": "shop"}')
+
+    assert main(["--config", str(config), "--out-root", str(tmp_path / "out")]) == 1
+    err = capsys.readouterr().err
+    assert "is not a directory" in err
+    assert "app/main.py" not in err
+    assert not (tmp_path / "out").exists()
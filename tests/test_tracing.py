@@ -0,0 +1,62 @@
+"""Tests for span recording and trace export."""
+
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from fastapi_boilerplate_agent.tracing import record_usage, span, tracing
+
+
+@pytest.fixture
+def tracer():
+    with tracing() as tracer:
+        with span("outer", "node", request=1):
+            with span("inner") as args:
+                args["files"] = 3
+            usage = {"input_tokens": 10, "output_tokens": 4, "total_tokens": 14}
+            record_usage(AIMessage(content="", usage_metadata=usage))
+    return tracer
+
+
+def test_spans_nest(tracer):
+    inner, outer = tracer.spans  # recorded as they close
+    assert (outer.name, outer.category, outer.args) == ("outer", "node", {"request": 1})
+    assert (inner.name, inner.category, inner.args) == ("inner", "phase", {"files": 3})
+    assert outer.start_us <= inner.start_us
+    assert inner.start_us + inner.duration_us <= outer.start_us + outer.duration_us
+    assert inner.thread_id == outer.thread_id
+
+
+def test_no_spans_without_tracer(tracer):
+    with span("ignored") as args:
+        args["x"] = 1
+    assert record_usage(AIMessage(content="")) == {}
+    assert [s.name for s in tracer.spans] == ["inner", "outer"]
+
+
+def test_chrome_export(tracer, tmp_path):
+    path = tmp_path / "trace.json"
+    tracer.export(str(path))
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    assert trace["otherData"] == {"llm_calls": 1, "prompt_tokens": 10, "completion_tokens": 4}
+    events = {event["name"]: event for event in trace["traceEvents"]}
+    assert set(events) == {"inner", "outer"}
+    outer = events["outer"]
+    assert outer["ph"] == "X"
+    assert outer["cat"] == "node"
+    assert set(outer) == {"name", "cat", "ph", "ts", "dur", "pid", "tid", "args"}
+
+
+def test_jsonl_export(tracer, tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer.export(str(path))
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["inner", "outer"]
+    assert set(lines[0]) == {"name", "category", "start_us", "duration_us", "thread_id", "args"}
+
+
+def test_unknown_export_format(tracer, tmp_path):
+    with pytest.raises(ValueError, match="Unsupported trace format"):
+        tracer.export(str(tmp_path / "trace.json"), fmt="xml")
@@ -0,0 +1,69 @@
+"""Tests for the project writer and its regeneration manifest."""
+
+import json
+
+from fastapi_boilerplate_agent.cli import main
+from fastapi_boilerplate_agent.writer import MANIFEST_NAME, read_manifest, write_project
+
+FILES = {"app/main.py": "main\n", "app/extra/cache.py": "cache\n", "README.md": "readme\n"}
+
+
+def test_second_run_skips_unchanged_files(tmp_path):
+    write_project(FILES, tmp_path)
+    mtime_ns = (tmp_path / "app/main.py").stat().st_mtime_ns
+
+    report = write_project({**FILES, "README.md": "new readme\n"}, tmp_path)
+    assert sorted(report.unchanged) == ["app/extra/cache.py", "app/main.py"]
+    assert report.changed == ["README.md"]
+    assert (tmp_path / "app/main.py").stat().st_mtime_ns == mtime_ns
+    assert (tmp_path / "README.md").read_text() == "new readme\n"
+
+
+def test_prune_deletes_only_stale_manifest_files(tmp_path):
+    write_project(FILES, tmp_path)
+    (tmp_path / "notes.txt").write_text("mine\n")  # never generated
+
+    report = write_project({"app/main.py": "main\n"}, tmp_path, prune=True)
+    assert report.pruned == ["README.md", "app/extra/cache.py"]
+    assert not (tmp_path / "README.md").exists()
+    assert not (tmp_path / "app/extra").exists()  # left empty
+    assert (tmp_path / "app/main.py").exists()
+    assert (tmp_path / "notes.txt").read_text() == "mine\n"
+    assert list(read_manifest(tmp_path)) == ["app/main.py"]
+
+
+def test_prune_keeps_edited_files(tmp_path):
+    write_project(FILES, tmp_path)
+    (tmp_path / "README.md").write_text("edited by hand\n")
+
+    report = write_project({"app/main.py": "main\n"}, tmp_path, prune=True)
+    assert report.removed == ["README.md", "app/extra/cache.py"]
+    assert report.pruned == ["app/extra/cache.py"]
+    assert (tmp_path / "README.md").read_text() == "edited by hand\n"
+    # Still tracked, so that it can be pruned once the edit is reverted
+    assert "README.md" in read_manifest(tmp_path)
+
+
+def test_without_prune_stale_files_are_kept(tmp_path):
+    write_project(FILES, tmp_path)
+    report = write_project({"app/main.py": "main\n"}, tmp_path)
+    assert report.pruned == []
+    assert (tmp_path / "README.md").exists()
+    assert "README.md" in json.loads((tmp_path / MANIFEST_NAME).read_text())["files"]
+
+
+def test_cli_prune(tmp_path):
+    config = tmp_path / "project.json"
+    out_root = tmp_path / "out"
+    project = out_root / "shop"
+
+    config.write_text('{"project_name": "shop", "db": "sqlite", "service_cache": true}')
+    assert main(["--config", str(config), "--out-root", str(out_root), "--no-check"]) == 0
+    assert (project / "app/core/cache.py").exists()
+    (project / "tests/test_cache.py").write_text("# my own cache tests\n")
+
+    config.write_text('{"project_name": "shop", "db": "sqlite"}')
+    assert main(["--config", str(config), "--out-root", str(out_root), "--prune"]) == 0
+    assert not (project / "app/core/cache.py").exists()
+    assert (project / "tests/test_cache.py").read_text() == "# my own cache tests\n"
+    assert (project / "app/main.py").exists()